@@ -10,6 +10,9 @@ from loguru import logger
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Set once .env has been found readable (or created), so later calls only stat it
+_env_file_ready = False
+
 
 def ensure_env_file() -> None:
     """
@@ -19,7 +22,10 @@ def ensure_env_file() -> None:
     so this function will skip creation if the file already exists or if we don't
     have write permissions.
     """
+    global _env_file_ready
     env_path = Path(".env")
+    if _env_file_ready and env_path.exists():
+        return
     
     # Check if .env already exists and is readable
     if env_path.exists():
@@ -27,6 +33,7 @@ def ensure_env_file() -> None:
         try:
             env_path.read_text(encoding="utf-8")
             logger.debug(".env file already exists and is readable")
+            _env_file_ready = True
             return
         except PermissionError:
             logger.warning(".env file exists but is not readable, skipping auto-creation")
@@ -63,6 +70,7 @@ def ensure_env_file() -> None:
         
         # Try to create the file
         copyfile(env_example_path, env_path)
+        _env_file_ready = True
         logger.info(f"Created .env file from .env.example at {env_path.absolute()}")
         logger.info("Please edit .env file with your actual configuration values")
     except PermissionError:
@@ -296,18 +296,19 @@ class EmailFetcher:
             # Parse date
             received_date = msg.date or datetime.now()
 
-            return RawEmail(
-                message_id=msg.uid or f"no-id-{datetime.now().timestamp()}",
-                thread_id=getattr(msg, "thread_id", None),
-                subject=msg.subject or "(No Subject)",
-                sender=sender_name,
-                sender_email=sender_email,
-                date=received_date,
-                html_content=html_content,
-                text_content=text_content,
-                labels=list(msg.flags) if hasattr(msg, "flags") else [],
-                urls=urls,
-            )
+            # Every field is built here with the right type, so skip validation
+            return RawEmail.from_trusted({
+                "message_id": msg.uid or f"no-id-{datetime.now().timestamp()}",
+                "thread_id": getattr(msg, "thread_id", None),
+                "subject": msg.subject or "(No Subject)",
+                "sender": sender_name,
+                "sender_email": sender_email,
+                "date": received_date,
+                "html_content": html_content,
+                "text_content": text_content,
+                "labels": list(msg.flags) if hasattr(msg, "flags") else [],
+                "urls": urls,
+            })
 
         except (ValueError, AttributeError) as e:
             logger.error(f"Failed to convert message: {e}")
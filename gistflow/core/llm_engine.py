@@ -3,6 +3,7 @@ LLM Engine module for intelligent content extraction.
 Uses LangChain to interact with LLM and force structured JSON output.
 """
 
+import copy
 import time
 from pathlib import Path
 from typing import Optional
@@ -146,6 +147,29 @@ class GistEngine:
             HumanMessagePromptTemplate.from_template(self._user_prompt_template),
         ])
 
+    def with_prompts(
+        self,
+        system_prompt: Optional[str] = None,
+        user_prompt_template: Optional[str] = None,
+    ) -> "GistEngine":
+        """
+        Create an engine that uses different prompts but shares this one's LLM client.
+
+        Args:
+            system_prompt: System prompt to use instead of the current one.
+            user_prompt_template: User prompt template to use instead of the current one.
+
+        Returns:
+            A new GistEngine; this engine is left unchanged.
+        """
+        engine = copy.copy(self)
+        if system_prompt:
+            engine._system_prompt = system_prompt
+        if user_prompt_template:
+            engine._user_prompt_template = user_prompt_template
+        engine.prompt = engine._build_prompt()
+        return engine
+
     def get_prompts(self) -> dict[str, str]:
         """
         Get current prompt contents.
@@ -177,7 +201,6 @@ class GistEngine:
         Raises:
             APIError: If all retries fail due to API issues.
         """
-        import json
         import re
 
         logger.info("Starting LLM call (structured output)...")
@@ -190,8 +213,6 @@ class GistEngine:
             gist = structured_llm.invoke(messages)
             elapsed = time.time() - call_start_time
             logger.info(f"LLM structured output completed in {elapsed:.2f}s")
-            # Normalize mentioned_links in case LLM returns objects
-            gist = self._normalize_gist_links(gist)
             return gist
         except (ValidationError, ValueError, TypeError, KeyError, AttributeError) as e:
             # If structured output fails (e.g., validation error, type mismatch), fall back to manual parsing
@@ -256,76 +277,19 @@ class GistEngine:
             # Try raw JSON
             json_str = raw_content.strip()
 
-        # Parse JSON and create Gist
+        # Parse and validate the JSON in one pass (Gist normalizes link objects itself)
         try:
             logger.debug("Parsing LLM response JSON...")
-            data = json.loads(json_str)
-            
-            # Normalize mentioned_links: handle both string list and object list
-            data = self._normalize_data_links(data)
+            gist = Gist.model_validate_json(json_str)
             
             total_elapsed = time.time() - call_start_time
             logger.debug(f"Successfully parsed Gist from LLM response (total elapsed: {total_elapsed:.2f}s)")
-            return Gist(**data)
-        except (json.JSONDecodeError, TypeError) as e:
+            return gist
+        except ValidationError as e:
             total_elapsed = time.time() - call_start_time
             logger.error(f"Failed to parse LLM output as Gist after {total_elapsed:.2f}s: {e}")
             raise ValueError(f"Failed to parse LLM output as Gist: {e}")
 
-    def _normalize_gist_links(self, gist: Gist) -> Gist:
-        """
-        Normalize mentioned_links in Gist object.
-        Handles cases where LLM returns objects instead of strings.
-        
-        Args:
-            gist: Gist object to normalize.
-            
-        Returns:
-            Normalized Gist object.
-        """
-        if not gist.mentioned_links:
-            return gist
-        
-        normalized_links = []
-        for link in gist.mentioned_links:
-            if isinstance(link, str):
-                normalized_links.append(link)
-            elif isinstance(link, dict):
-                # Extract URL from object
-                url = link.get("url") or link.get("link") or link.get("href") or link.get("value")
-                if url and isinstance(url, str):
-                    normalized_links.append(url)
-                else:
-                    logger.warning(f"Skipping link object without valid URL: {link}")
-        
-        gist.mentioned_links = normalized_links
-        return gist
-    
-    def _normalize_data_links(self, data: dict) -> dict:
-        """
-        Normalize mentioned_links in data dictionary.
-        
-        Args:
-            data: Dictionary containing Gist data.
-            
-        Returns:
-            Normalized dictionary.
-        """
-        if "mentioned_links" in data and data["mentioned_links"]:
-            normalized_links = []
-            for link in data["mentioned_links"]:
-                if isinstance(link, str):
-                    normalized_links.append(link)
-                elif isinstance(link, dict):
-                    # Extract URL from object (could be 'url', 'link', 'href', etc.)
-                    url = link.get("url") or link.get("link") or link.get("href") or link.get("value")
-                    if url and isinstance(url, str):
-                        normalized_links.append(url)
-                    else:
-                        logger.warning(f"Skipping link object without valid URL: {link}")
-            data["mentioned_links"] = normalized_links
-        return data
-
     def extract_gist(
         self,
         content: str,
@@ -453,19 +417,19 @@ class GistEngine:
         # Fallback: create minimal Gist without LLM
         logger.warning(f"Using fallback Gist generation for {original_id}")
 
-        return Gist(
-            title=subject,
-            summary="内容处理失败，请手动查看原文。" if content else "无内容",
-            score=30,
-            tags=["待处理"],
-            key_insights=["LLM 处理失败，需人工审核"],
-            mentioned_links=[],
-            is_spam_or_irrelevant=False,
-            original_id=original_id,
-            sender=sender,
-            original_url=original_url,
-            raw_markdown=content[:500] if content else None,
-        )
+        return Gist.from_trusted({
+            "title": subject,
+            "summary": "内容处理失败，请手动查看原文。" if content else "无内容",
+            "score": 30,
+            "tags": ["待处理"],
+            "key_insights": ["LLM 处理失败，需人工审核"],
+            "mentioned_links": [],
+            "is_spam_or_irrelevant": False,
+            "original_id": original_id,
+            "sender": sender,
+            "original_url": original_url,
+            "raw_markdown": content[:500] if content else None,
+        })
 
     def test_connection(self) -> bool:
         """
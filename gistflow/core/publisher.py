@@ -3,28 +3,687 @@ Notion Publisher module for writing processed gists to Notion database.
 Handles page creation, property mapping, and content block generation.
 """
 
+import atexit
+import functools
+import itertools
 import re
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from datetime import datetime
 from typing import Optional
 
+import httpx
+import orjson
 from loguru import logger
 from notion_client import Client
-from notion_client.errors import APIResponseError, HTTPResponseError
-from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
+from notion_client.errors import APIResponseError, HTTPResponseError, RequestTimeoutError
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+    wait_random_exponential,
+)
 
 from gistflow.config import Settings
 from gistflow.models import Gist
 
 # Notion API 限制：单段 rich_text 的 text.content 长度 ≤ 2000
 NOTION_RICH_TEXT_MAX = 2000
+# Notion API 限制：单个 block 的 rich_text 数组最多 100 段
+NOTION_MAX_RICH_TEXT_SEGMENTS = 100
+
+# Heading block types indexed by level - 1. Literal keys are interned at compile time,
+# unlike f"heading_{level}" which builds a fresh key string for every heading block.
+_HEADING_TYPES = ("heading_1", "heading_2", "heading_3")
+
+
+# Links that are never worth surfacing (unsubscribe, social media, tracking redirects...)
+_NOISE_LINK_RE = re.compile(
+    "|".join([
+        r'unsubscribe',
+        r'取消订阅',
+        r'退订',
+        r'view.*browser',
+        r'在浏览器中查看',
+        r'twitter\.com',
+        r'facebook\.com',
+        r'linkedin\.com',
+        r'instagram\.com',
+        r'substack\.com/redirect',  # Substack redirect links
+        r'email.*settings',
+        r'privacy.*policy',
+        r'terms.*service',
+    ]),
+    re.IGNORECASE,
+)
+_MD_LINK_RE = re.compile(r'\[([^\]]+)\]\(([^)]+)\)')
+_URL_RE = re.compile(r'https?://[^\s\)]+')
+_NUMBERED_ITEM_RE = re.compile(r'^\d+\.\s')
+_NUMBERED_PREFIX_RE = re.compile(r'^\d+\.\s+')
+# A whole line of table separator characters, more than 3 once stripped, plus its line break
+_TABLE_SEPARATOR_LINE_RE = re.compile(r'^[^\S\n]*[|:\-](?:[^\S\n]|[|:\-]){2,}[|:\-][^\S\n]*(?:\n|$)', re.MULTILINE)
+_PIPE_RUN_RE = re.compile(r'\|{5,}')
+_TABLE_SEPARATOR_RE = re.compile(r'\|[\s\-:]{3,}\|')
+
+
+# Notion accepts at most 100 children per append request
+NOTION_MAX_BLOCKS_PER_REQUEST = 100
+# Notion rejects request bodies over 500KB; keep each request body under this many bytes
+NOTION_MAX_REQUEST_BYTES = 450_000
+# Largest serialized top-level block; the rest of the budget covers the page properties
+NOTION_MAX_BLOCK_BYTES = 400_000
+
+# Database schemas rarely change; reuse a retrieved schema for this many seconds
+NOTION_SCHEMA_CACHE_TTL_SECONDS = 300.0
+
+# Built page payloads kept for re-pushes of a gist whose publish failed
+NOTION_BUILD_CACHE_SIZE = 32
+
+# Proactive request pacing, kept under Notion's ~3 requests/s average with a small burst
+NOTION_REQUESTS_PER_SECOND = 2.0
+NOTION_REQUEST_BURST = 3
+
+# Upper bound on a server-prescribed Retry-After wait
+NOTION_MAX_RETRY_AFTER_SECONDS = 60.0
+
+# Consecutive failed Notion requests that open the circuit, and how long it stays open
+NOTION_CIRCUIT_FAIL_MAX = 5
+NOTION_CIRCUIT_RESET_SECONDS = 60.0
+
+
+class AimdController:
+    """
+    Additive-increase / multiplicative-decrease controller for request sizing.
+    Grows the allowed size by a fixed step after each success and cuts it by a
+    factor after each failure, converging on what Notion currently tolerates.
+    """
+
+    def __init__(
+        self,
+        initial: int = NOTION_MAX_BLOCKS_PER_REQUEST,
+        minimum: int = 10,
+        maximum: int = NOTION_MAX_BLOCKS_PER_REQUEST,
+        increase: int = 10,
+        decrease: float = 0.5,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            initial: Starting size.
+            minimum: Lower bound for the size.
+            maximum: Upper bound for the size.
+            increase: Amount added after a success.
+            decrease: Factor applied after a failure.
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self._size = float(initial)
+
+    @property
+    def size(self) -> int:
+        """Current allowed size."""
+        return int(self._size)
+
+    def on_success(self) -> None:
+        """Additive increase after a successful request."""
+        self._size = min(self.maximum, self._size + self.increase)
+
+    def on_failure(self) -> None:
+        """Multiplicative decrease after a failed request."""
+        self._size = max(self.minimum, self._size * self.decrease)
+
+
+class RateLimiter:
+    """
+    Token-bucket pacing for Notion requests (GCRA form).
+    Each acquire reserves the next free slot under a lock and then waits outside it,
+    so threads share one budget without holding the lock while sleeping. Up to `burst` requests go out back to back before pacing kicks in.
+    """
+
+    def __init__(self, rate: float = NOTION_REQUESTS_PER_SECOND, burst: int = NOTION_REQUEST_BURST) -> None:
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Sustained requests per second.
+            burst: Requests allowed back to back when the bucket is full.
+        """
+        self._interval = 1.0 / rate
+        self._tolerance = (burst - 1) * self._interval
+        self._tat = 0.0  # theoretical arrival time of the next request
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Reserve a slot and return how long the caller must wait for it."""
+        with self._lock:
+            now = time.monotonic()
+            tat = max(self._tat, now)
+            self._tat = tat + self._interval
+            return max(0.0, tat - self._tolerance - now)
+
+    def acquire(self) -> None:
+        """Block until a request may be sent."""
+        delay = self._reserve()
+        if delay:
+            time.sleep(delay)
+
+
+class _NotionWait:
+    """
+    Tenacity wait strategy for Notion calls.
+    Sleeps for the server's Retry-After on 429 responses and falls back to
+    full-jitter exponential backoff (random up to 2s, 4s, 8s, 16s, 30s) for everything
+    else, so gists failing together do not retry in lockstep.
+    """
+
+    def __init__(self) -> None:
+        self._backoff = wait_random_exponential(multiplier=2, max=30)
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exc, HTTPResponseError) and exc.status == 429:
+            retry_after = exc.headers.get("Retry-After")
+            try:
+                return min(float(retry_after), NOTION_MAX_RETRY_AFTER_SECONDS)
+            except (TypeError, ValueError):
+                pass
+        return self._backoff(retry_state)
+
+
+_wait_notion = _NotionWait()
+
+# Failures of a single create/append attempt that are worth retrying. notion_client
+# raises RequestTimeoutError for timeouts and lets other httpx.TransportError
+# subclasses (connect/read errors) through unwrapped; neither is an HTTPResponseError.
+_RETRYABLE_NOTION_ERRORS = (HTTPResponseError, RequestTimeoutError, httpx.TransportError, ConnectionError, TimeoutError)
+
+# Shared by every publisher: the Notion rate limit applies per integration, not per instance
+_rate_limiter = RateLimiter()
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Notion while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for Notion requests.
+    Used as a context manager around each request attempt: once fail_max attempts
+    in a row fail with a server/network error, every call raises CircuitOpenError
+    for reset_timeout seconds, so tenacity stops retrying and batches fail fast
+    during an outage instead of sleeping through the full backoff for every gist.
+    After the cool-down the breaker is half-open: the next success closes it, while
+    a single further failure reopens it straight away.
+    """
+
+    def __init__(
+        self, fail_max: int = NOTION_CIRCUIT_FAIL_MAX, reset_timeout: float = NOTION_CIRCUIT_RESET_SECONDS
+    ) -> None:
+        """
+        Initialize the breaker.
+
+        Args:
+            fail_max: Consecutive failures that open the circuit.
+            reset_timeout: Seconds the circuit stays open before calls are allowed again.
+        """
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._open_until = 0.0
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls are currently being short-circuited."""
+        return time.monotonic() < self._open_until
+
+    def __enter__(self) -> "CircuitBreaker":
+        if self.is_open:
+            raise CircuitOpenError(
+                f"Notion circuit open for another {self._open_until - time.monotonic():.0f}s after repeated failures"
+            )
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        if exc is None:
+            self._failures = 0
+        elif self._is_outage_error(exc):
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                # Stay one failure away from reopening until a call succeeds (half-open)
+                self._failures = self.fail_max - 1
+                self._open_until = time.monotonic() + self.reset_timeout
+                logger.warning(f"Notion circuit opened for {self.reset_timeout:.0f}s after {self.fail_max} consecutive failures")
+        return False
+
+    @staticmethod
+    def _is_outage_error(exc: BaseException) -> bool:
+        """Rate limits, 5xx and network errors count; other 4xx are request bugs, not outages."""
+        if isinstance(exc, HTTPResponseError):
+            return exc.status == 429 or exc.status >= 500
+        return isinstance(exc, (ConnectionError, TimeoutError, RequestTimeoutError, httpx.TransportError))
+
+
+def _orjson_request_kwargs(kwargs: dict, json: object) -> dict:
+    """Swap an httpx json= body for orjson-encoded content with the matching header."""
+    if json is not None:
+        headers = httpx.Headers(kwargs.get("headers"))
+        headers["Content-Type"] = "application/json"
+        kwargs["headers"] = headers
+        kwargs["content"] = orjson.dumps(json)
+    return kwargs
+
+
+class _OrjsonClient(httpx.Client):
+    """httpx client that encodes notion_client request bodies with orjson instead of stdlib json."""
+
+    def build_request(self, *args, json: object = None, **kwargs) -> httpx.Request:
+        return super().build_request(*args, **_orjson_request_kwargs(kwargs, json))
+
+
+# Static blocks shared by every page. They are only ever serialized, never mutated,
+# so the same dict objects are appended directly instead of rebuilt per gist.
+_DIVIDER_BLOCK = {"object": "block", "type": "divider", "divider": {}}
+
+_SECTION_HEADINGS = {
+    key: {
+        "object": "block",
+        "type": "heading_2",
+        "heading_2": {"rich_text": [{"type": "text", "text": {"content": title}}]},
+    }
+    for key, title in (("summary", "📋 摘要"), ("insights", "💡 核心要点"), ("links", "📎 相关链接"))
+}
+
+# Display format for the received date inside the raw-content toggle
+_RECEIVED_AT_FORMAT = "%Y年%m月%d日 %H:%M"
+
+# Gray bold label spans for the email header lines inside the raw-content toggle
+_LABEL_ANNOTATIONS = {"bold": True, "color": "gray"}
+_SENDER_LABEL = {"type": "text", "text": {"content": "发件人: "}, "annotations": _LABEL_ANNOTATIONS}
+_DATE_LABEL = {"type": "text", "text": {"content": "日期: "}, "annotations": _LABEL_ANNOTATIONS}
+_LINK_LABEL = {"type": "text", "text": {"content": "链接: "}, "annotations": _LABEL_ANNOTATIONS}
+
+# Gray italic spans: the toggle title and the message ID footer
+_FOOTER_ANNOTATIONS = {"color": "gray", "italic": True}
+
+# Title of the collapsed toggle wrapping the raw email content
+_EMAIL_TOGGLE_TITLE = [{
+    "type": "text",
+    "text": {"content": "📧 邮件原文（点击展开）"},
+    "annotations": _FOOTER_ANNOTATIONS
+}]
+
+
+# Shared inline annotation dicts. Blocks are never mutated after building (orjson only
+# reads them), so every bold/italic/link span can point at the same instance.
+_BOLD_ANNOTATIONS = {"bold": True}
+_ITALIC_ANNOTATIONS = {"italic": True}
+_LINK_ANNOTATIONS = {"color": "blue"}
+_BOLD_LINK_ANNOTATIONS = {"bold": True, "color": "blue"}
+_ITALIC_LINK_ANNOTATIONS = {"italic": True, "color": "blue"}
+
+
+def _message_id_block(original_id: str) -> dict:
+    """Build the gray italic footer paragraph showing the (shortened) message ID."""
+    return {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {
+            "rich_text": [{
+                "type": "text",
+                "text": {"content": f"📧 Message ID: {original_id[:20]}"},
+                "annotations": _FOOTER_ANNOTATIONS,
+            }]
+        }
+    }
+
+
+@functools.lru_cache(maxsize=4)
+def _get_notion_client(api_key: str) -> Client:
+    """
+    Return the process-wide Notion client for an integration token.
+
+    Publishers sharing a token (e.g. one per database) share one pooled keep-alive
+    HTTP/2 connection pool. The SDK writes the auth header onto its httpx client,
+    so the pool is per token rather than global.
+
+    Args:
+        api_key: Notion integration token.
+
+    Returns:
+        Notion client backed by a pooled, orjson-encoding httpx client.
+    """
+    http_client = _OrjsonClient(
+        http2=True,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=20, keepalive_expiry=60.0),
+    )
+    atexit.register(http_client.close)
+    return Client(auth=api_key, client=http_client)
+
+
+def _split_rich_text(rich_text: Iterable[dict]) -> Iterator[dict]:
+    """
+    Yield rich_text items with every item over 2000 chars cut into 2000-char
+    segments that keep their link and annotations.
+
+    Args:
+        rich_text: Inline rich_text items.
+
+    Yields:
+        Rich_text items within Notion's per-segment limit.
+    """
+    for item in rich_text:
+        item_text = item.get("text", {}).get("content", "")
+        if len(item_text) <= NOTION_RICH_TEXT_MAX:
+            yield item
+        else:
+            for i in range(0, len(item_text), NOTION_RICH_TEXT_MAX):
+                yield {**item, "text": {**item["text"], "content": item_text[i:i + NOTION_RICH_TEXT_MAX]}}
+
+
+def _fit_rich_text(rich_text: list[dict]) -> list[dict]:
+    """
+    Fit rich_text into a single block: at most 100 segments of at most 2000 chars.
+    Text beyond the last segment is dropped.
+
+    Args:
+        rich_text: Inline rich_text items.
+
+    Returns:
+        Rich_text items for one block.
+    """
+    return list(itertools.islice(_split_rich_text(rich_text), NOTION_MAX_RICH_TEXT_SEGMENTS))
+
+
+def _paragraph_blocks(rich_text: list[dict]) -> Iterator[dict]:
+    """
+    Yield paragraph blocks for one Markdown paragraph in a single pass.
+
+    The 2000-char limit applies per rich_text segment, not per block, so a long
+    paragraph stays one block made of up to 100 segments; oversized items are cut
+    into 2000-char segments that keep their link and annotations, and a paragraph
+    needing more than 100 segments continues in further blocks.
+
+    Args:
+        rich_text: Inline rich_text items of the paragraph, not yet cut to the
+            2000-char limit.
+
+    Yields:
+        Notion paragraph block dictionaries.
+    """
+    segments: list[dict] = []
+    for piece in _split_rich_text(rich_text):
+        segments.append(piece)
+        if len(segments) == NOTION_MAX_RICH_TEXT_SEGMENTS:
+            yield {"object": "block", "type": "paragraph", "paragraph": {"rich_text": segments}}
+            segments = []
+    if segments:
+        yield {"object": "block", "type": "paragraph", "paragraph": {"rich_text": segments}}
+
+
+def _split_oversized_block(block: dict) -> list[tuple[dict, int]]:
+    """
+    Split a block whose serialized size exceeds NOTION_MAX_BLOCK_BYTES.
+
+    The block's children (or, for leaf blocks, its rich_text segments) are packed
+    greedily into copies of the block that each fit the limit, so e.g. the raw-email
+    toggle becomes several consecutive toggles. Nested children are split first.
+
+    Args:
+        block: A Notion block dictionary.
+
+    Returns:
+        (block, serialized size in bytes) pairs, in order.
+    """
+    size = len(orjson.dumps(block))
+    if size <= NOTION_MAX_BLOCK_BYTES:
+        return [(block, size)]
+
+    block_type = block.get("type")
+    payload = block.get(block_type) or {}
+    if payload.get("children"):
+        key = "children"
+        items = [piece for child in payload["children"] for piece in _split_oversized_block(child)]
+    elif len(payload.get("rich_text") or ()) > 1:
+        key = "rich_text"
+        items = [(item, len(orjson.dumps(item))) for item in payload["rich_text"]]
+    else:
+        logger.warning(f"Cannot split oversized {block_type} block ({size} bytes)")
+        return [(block, size)]
+
+    # Only the array contents differ between copies, so sizes add up exactly
+    base_size = len(orjson.dumps({**block, block_type: {**payload, key: []}}))
+    pieces: list[tuple[dict, int]] = []
+    group: list[dict] = []
+    group_size = base_size
+    for item, item_size in items:
+        if group and group_size + 1 + item_size > NOTION_MAX_BLOCK_BYTES:
+            pieces.append(({**block, block_type: {**payload, key: group}}, group_size))
+            group, group_size = [], base_size
+        group_size += item_size + (1 if group else 0)
+        group.append(item)
+    pieces.append(({**block, block_type: {**payload, key: group}}, group_size))
+    return pieces
+
+
+def _fit_blocks(blocks: list[dict], email_content_start_index: Optional[int]) -> tuple[list[dict], list[int], Optional[int]]:
+    """
+    Split oversized blocks and measure every block once.
+
+    Args:
+        blocks: Content blocks of the page.
+        email_content_start_index: Index of the email content block (if any).
+
+    Returns:
+        Tuple of (blocks, serialized size of each block, index of the first email
+        content block or None).
+    """
+    fitted: list[dict] = []
+    sizes: list[int] = []
+    new_email_index = None
+    for i, block in enumerate(blocks):
+        if i == email_content_start_index:
+            new_email_index = len(fitted)
+        for piece, size in _split_oversized_block(block):
+            fitted.append(piece)
+            sizes.append(size)
+    return fitted, sizes, new_email_index
+
+
+# Bytes of an append request body around its blocks: {"children":[...]}
+_APPEND_BODY_OVERHEAD = len(orjson.dumps({"children": []}))
+
+
+def _chunk_end(block_sizes: list[int], start: int, max_blocks: int, base_size: int = _APPEND_BODY_OVERHEAD) -> int:
+    """
+    Find where the request chunk starting at `start` should end.
+
+    The chunk grows up to max_blocks blocks while the request body, measured as the
+    orjson bytes the client sends (envelope, blocks and separating commas), stays
+    within NOTION_MAX_REQUEST_BYTES. It always takes at least one block; blocks are
+    split by _fit_blocks beforehand so a single block always fits.
+
+    Args:
+        block_sizes: Serialized size of each content block of the page.
+        start: Index of the chunk's first block.
+        max_blocks: Maximum number of blocks in the chunk.
+        base_size: Bytes of the request body with an empty children list.
+
+    Returns:
+        Index one past the chunk's last block.
+    """
+    limit = min(len(block_sizes), start + max_blocks)
+    end = start
+    size = base_size
+    while end < limit:
+        size += block_sizes[end] + (1 if end > start else 0)
+        if size > NOTION_MAX_REQUEST_BYTES and end > start:
+            break
+        end += 1
+    return end
+
+
+def _page_signature(gist: Gist) -> int:
+    """
+    Hash the gist fields that end up in the Notion page.
+
+    Cheaper than serializing the gist: str hashes are cached on the string objects,
+    so re-hashing an unchanged raw_markdown costs nothing.
+    """
+    return hash((
+        gist.title,
+        gist.summary,
+        gist.score,
+        tuple(gist.tags),
+        tuple(gist.key_insights),
+        tuple(gist.mentioned_links),
+        gist.is_spam_or_irrelevant,
+        gist.sender,
+        gist.received_at,
+        gist.raw_markdown,
+        gist.original_url,
+    ))
 
 
 def _truncate_for_notion(text: str, max_len: int = NOTION_RICH_TEXT_MAX) -> str:
     """Ensure string length is within Notion rich_text limit (≤2000)."""
-    if not text:
+    if not text or len(text) <= max_len:
         return text
     return text[:max_len]
 
 
+def _find_bold(text: str, pos: int, end: int) -> Optional[tuple[int, int]]:
+    """
+    Find the first bold span (**text**, no '*' inside) in text[pos:end].
+
+    Returns:
+        (opening index, closing index) of the '**' delimiters, or None.
+    """
+    start = text.find('**', pos, end)
+    while start != -1:
+        close = text.find('*', start + 2, end)
+        if close == -1:
+            return None
+        if close > start + 2 and close + 1 < end and text[close + 1] == '*':
+            return start, close
+        start = text.find('**', start + 1, end)
+    return None
+
+
+def _find_italic(text: str, pos: int, end: int) -> Optional[tuple[int, int]]:
+    """
+    Find the first italic span (*text*, not part of **) in text[pos:end].
+
+    The opening '*' must not follow another '*' and the closing one must not be
+    followed by one; the character before pos counts for the former.
+
+    Returns:
+        (opening index, closing index) of the '*' delimiters, or None.
+    """
+    start = text.find('*', pos, end)
+    while start != -1:
+        close = text.find('*', start + 1, end)
+        if close == -1:
+            return None
+        if (
+            close > start + 1
+            and (start == 0 or text[start - 1] != '*')
+            and (close + 1 == end or text[close + 1] != '*')
+        ):
+            return start, close
+        start = close
+    return None
+
+
+def _italic_at(text: str, pos: int, end: int) -> Optional[tuple[int, int]]:
+    """
+    Match an italic span opening exactly at pos, ignoring the character before it
+    (which may be the closing '*' of the previous span).
+
+    Returns:
+        (opening index, closing index) of the '*' delimiters, or None.
+    """
+    if text[pos] != '*':
+        return None
+    close = text.find('*', pos + 1, end)
+    if close > pos + 1 and (close + 1 == end or text[close + 1] != '*'):
+        return pos, close
+    return None
+
+
+def _append_inline_spans(
+    items: list[dict], text: str, start: int, end: int, link_url: Optional[str] = None, *, is_link: bool = False
+) -> None:
+    """
+    Append Notion rich_text items for bold (**text**) and italic (*text*) spans in text[start:end].
+
+    Scans the original string in place, so callers never slice out segments, and emits
+    final items directly: inside a link each item already carries the link and the
+    link-coloured annotations instead of being rewritten afterwards.
+
+    Args:
+        items: List the rich_text items are appended to.
+        text: Full text being parsed.
+        start: Start of the span to parse.
+        end: End (exclusive) of the span to parse.
+        link_url: Link target for the span; only http(s) URLs become links.
+        is_link: Whether the span is the text of a Markdown link.
+    """
+    if is_link:
+        link = {"url": link_url[:2000]} if link_url.startswith("http") else None
+        plain_annotations = _LINK_ANNOTATIONS
+        bold_annotations = _BOLD_LINK_ANNOTATIONS
+        italic_annotations = _ITALIC_LINK_ANNOTATIONS
+    else:
+        plain_annotations = None
+        bold_annotations = _BOLD_ANNOTATIONS
+        italic_annotations = _ITALIC_ANNOTATIONS
+
+    def append(content: str, annotations: Optional[dict]) -> None:
+        text_obj = {"content": content}
+        if is_link:
+            text_obj["link"] = link
+        item = {"type": "text", "text": text_obj}
+        if annotations is not None:
+            item["annotations"] = annotations
+        items.append(item)
+
+    i = start
+    # Next bold / italic match at or after i. A match that has not been overtaken
+    # by i is still the earliest one, so each pattern is searched again only after
+    # its match is consumed; this keeps the scan linear.
+    # Delimiters are located with str.find rather than regex search.
+    bold_next = _find_bold(text, start, end)
+    italic_next = _find_italic(text, start, end)
+
+    while i < end:
+        if bold_next and bold_next[0] < i:
+            bold_next = _find_bold(text, i, end)
+        if italic_next and italic_next[0] < i:
+            italic_next = _find_italic(text, i, end)
+        italic_match = _italic_at(text, i, end) or italic_next
+
+        # Earliest match wins; bold on a tie
+        if bold_next and (not italic_match or bold_next[0] <= italic_match[0]):
+            (open_pos, close_pos), width, annotations = bold_next, 2, bold_annotations
+        elif italic_match:
+            (open_pos, close_pos), width, annotations = italic_match, 1, italic_annotations
+        else:
+            # No more formatting, add remaining text
+            append(text[i:end], plain_annotations)
+            break
+
+        if open_pos > i:
+            append(text[i:open_pos], plain_annotations)
+        append(text[open_pos + width:close_pos], annotations)
+        i = close_pos + width
+
+
 class NotionPublisher:
     """
     Notion API publisher for creating pages from Gist objects.
@@ -39,40 +698,64 @@ class NotionPublisher:
             settings: Application settings containing Notion API credentials.
         """
         self.settings = settings
-        self.client = Client(auth=settings.NOTION_API_KEY)
+        # One pooled keep-alive HTTP/2 connection serves the page create and every chunk append
+        self.client = _get_notion_client(settings.NOTION_API_KEY)
         self.database_id = settings.NOTION_DATABASE_ID
+        # Shared across pushes so a degraded API keeps later pages on smaller chunks
+        self._chunk_controller = AimdController()
+        self._breaker = CircuitBreaker()
+        # (monotonic fetch time, properties) of the last databases.retrieve
+        self._properties_cache: Optional[tuple[float, dict]] = None
+        # original_id -> page_id of gists already published by this instance.
+        # LocalStore's processed_emails table is the persistent record; this
+        # only guards against the same gist being pushed twice in one process.
+        self._published_pages: dict[str, str] = {}
+        # original_id -> (page signature, (properties, blocks, block sizes, email content index)).
+        # Entries are dropped once the gist is published; insertion-ordered, FIFO eviction.
+        self._build_cache: dict[str, tuple[int, tuple[dict, list[dict], list[int], Optional[int]]]] = {}
+        self._build_cache_lock = threading.Lock()
 
         logger.info(f"NotionPublisher initialized for database: {self.database_id[:8]}...")
 
     @retry(
         stop=stop_after_attempt(5),  # Increased from 3 to 5 for better success rate
-        wait=wait_exponential(multiplier=2, min=2, max=30),  # Longer wait times: 2s, 4s, 8s, 16s, 30s
-        retry=retry_if_exception_type((HTTPResponseError, APIResponseError, ConnectionError, TimeoutError)),
+        wait=_wait_notion,  # Retry-After on 429, else jittered backoff up to 30s
+        retry=retry_if_exception_type(_RETRYABLE_NOTION_ERRORS),
         reraise=True,
     )
-    def _create_page_with_retry(self, properties: dict) -> dict:
+    def _create_page_with_retry(self, properties: dict, children: Optional[list[dict]] = None) -> dict:
         """
         Create a Notion page with retry mechanism.
         Uses aggressive retry strategy to maximize success rate.
 
         Args:
             properties: Notion page properties.
+            children: Initial content blocks (at most 100), sent in the same request.
 
         Returns:
             Created page object from Notion API.
 
         Raises:
             APIResponseError: If all retries fail (after 5 attempts).
+            CircuitOpenError: If the circuit breaker is open.
         """
-        return self.client.pages.create(
-            parent={"database_id": self.database_id},
-            properties=properties,
-        )
+        with self._breaker:
+            _rate_limiter.acquire()
+            if children:
+                return self.client.pages.create(
+                    parent={"database_id": self.database_id},
+                    properties=properties,
+                    children=children,
+                )
+            return self.client.pages.create(
+                parent={"database_id": self.database_id},
+                properties=properties,
+            )
 
     @retry(
         stop=stop_after_attempt(5),  # Increased from 3 to 5 for better success rate
-        wait=wait_exponential(multiplier=2, min=2, max=30),  # Longer wait times: 2s, 4s, 8s, 16s, 30s
-        retry=retry_if_exception_type((HTTPResponseError, APIResponseError, ConnectionError, TimeoutError)),
+        wait=_wait_notion,  # Retry-After on 429, else jittered backoff up to 30s
+        retry=retry_if_exception_type(_RETRYABLE_NOTION_ERRORS),
         reraise=True,
     )
     def _append_blocks_with_retry(self, page_id: str, blocks: list[dict]) -> dict:
@@ -89,11 +772,46 @@ class NotionPublisher:
 
         Raises:
             APIResponseError: If all retries fail (after 5 attempts).
+            CircuitOpenError: If the circuit breaker is open.
+        """
+        with self._breaker:
+            _rate_limiter.acquire()
+            return self.client.blocks.children.append(
+                block_id=page_id,
+                children=blocks,
+            )
+
+    def _should_publish(self, gist: Gist) -> bool:
         """
-        return self.client.blocks.children.append(
-            block_id=page_id,
-            children=blocks,
-        )
+        Check whether a gist passes the spam and value filters.
+
+        Args:
+            gist: The Gist object to check.
+
+        Returns:
+            True if the gist should be published.
+        """
+        if gist.is_spam_or_irrelevant:
+            logger.info(f"Skipping spam/irrelevant email: {gist.title}")
+            return False
+
+        if not gist.is_valuable(min_score=self.settings.MIN_VALUE_SCORE):
+            logger.info(f"Skipping low-value email (score={gist.score}, threshold={self.settings.MIN_VALUE_SCORE}): {gist.title}")
+            return False
+
+        return True
+
+    def forget_published(self, original_id: Optional[str] = None) -> None:
+        """
+        Allow a gist to be published again (e.g. after a manual reprocess).
+
+        Args:
+            original_id: Email message ID to forget, or None to forget all.
+        """
+        if original_id is None:
+            self._published_pages.clear()
+        else:
+            self._published_pages.pop(original_id, None)
 
     def push(self, gist: Gist) -> Optional[str]:
         """
@@ -105,31 +823,39 @@ class NotionPublisher:
         Returns:
             Notion page ID if successful, None otherwise.
         """
-        if gist.is_spam_or_irrelevant:
-            logger.info(f"Skipping spam/irrelevant email: {gist.title}")
+        if not self._should_publish(gist):
             return None
 
-        if not gist.is_valuable(min_score=self.settings.MIN_VALUE_SCORE):
-            logger.info(f"Skipping low-value email (score={gist.score}, threshold={self.settings.MIN_VALUE_SCORE}): {gist.title}")
-            return None
+        if gist.original_id and gist.original_id in self._published_pages:
+            logger.info(f"Gist already published, skipping: {gist.title}")
+            return self._published_pages[gist.original_id]
 
         try:
-            # Step 1: Create page with properties
-            properties = self._build_properties(gist)
-            page = self._create_page_with_retry(properties)
+            properties, blocks, block_sizes, email_content_start_index = self._build_page(gist)
+
+            # Step 1: Create page with properties and the first chunk of blocks in one request
+            first_chunk = blocks[:self._first_chunk_end(properties, block_sizes)]
+            page = self._create_page_with_retry(properties, first_chunk)
             page_id = page["id"]
 
             logger.info(f"Created Notion page: {page_id}")
 
-            # Step 2: Append content blocks
-            blocks = self._build_content_blocks(gist)
-            # Track which block index starts the email content section
-            email_content_start_index = self._find_email_content_start_index(blocks)
-            self._append_blocks_in_chunks(page_id, blocks, email_content_start_index)
+            # Step 2: Append remaining content blocks
+            if len(blocks) > len(first_chunk):
+                self._append_blocks_in_chunks(
+                    page_id, blocks, block_sizes, email_content_start_index, start=len(first_chunk)
+                )
 
             logger.info(f"Successfully published gist to Notion: {gist.title}")
+            if gist.original_id:
+                self._published_pages[gist.original_id] = page_id
+                with self._build_cache_lock:
+                    self._build_cache.pop(gist.original_id, None)
             return page_id
 
+        except CircuitOpenError as e:
+            logger.warning(f"Skipping Notion publish for gist '{gist.title}': {e}")
+            return None
         except APIResponseError as e:
             logger.error(f"Notion API error for gist '{gist.title}': {e}")
             return None
@@ -143,74 +869,110 @@ class NotionPublisher:
             # Handle data structure errors during page/block building
             logger.error(f"Data structure error building Notion page for '{gist.title}': {e}")
             return None
-        except ConnectionError as e:
-            # Handle network connection errors
+        except (RequestTimeoutError, httpx.TransportError, ConnectionError, TimeoutError) as e:
+            # Handle network connection errors and timeouts
             logger.error(f"Connection error publishing to Notion for '{gist.title}': {e}")
             return None
 
-    def _find_email_content_start_index(self, blocks: list[dict]) -> Optional[int]:
+    def _first_chunk_end(self, properties: dict, block_sizes: list[int]) -> int:
         """
-        Find the index of the block that starts the email content section.
-        
+        Find how many blocks can go with the page create request.
+
         Args:
-            blocks: List of block dictionaries.
-            
+            properties: Notion page properties sent in the same request.
+            block_sizes: Serialized size of each content block.
+
         Returns:
-            Index of the email content heading block, or None if not found.
-        """
-        for i, block in enumerate(blocks):
-            if block.get("type") == "heading_2":
-                heading = block.get("heading_2", {})
-                rich_text = heading.get("rich_text", [])
-                if rich_text and rich_text[0].get("text", {}).get("content") == "📧 邮件原文":
-                    return i
-        return None
+            Number of blocks for the create request.
+        """
+        base_size = len(orjson.dumps({
+            "parent": {"database_id": self.database_id},
+            "properties": properties,
+            "children": [],
+        }))
+        return _chunk_end(block_sizes, 0, self._chunk_controller.size, base_size)
+
+    def _iter_block_chunks(
+        self,
+        blocks: list[dict],
+        block_sizes: list[int],
+        email_content_start_index: Optional[int] = None,
+        start: int = 0,
+    ) -> Iterator[tuple[int, list[dict], bool]]:
+        """
+        Split blocks into append requests sized by the AIMD controller and the
+        request byte budget. The size is read lazily per chunk, so feedback from the
+        previous request applies.
+
+        Args:
+            blocks: List of block dictionaries to append.
+            block_sizes: Serialized size of each block.
+            email_content_start_index: Index of the block that starts email content section (if any).
+            start: Index of the first block still to be sent (earlier ones went with the page create).
 
-    def _append_blocks_in_chunks(self, page_id: str, blocks: list[dict], email_content_start_index: Optional[int] = None) -> None:
+        Yields:
+            Tuples of (chunk number, chunk blocks, whether the chunk is critical).
+        """
+        chunk_num = 0
+        chunk_start = start
+        while chunk_start < len(blocks):
+            chunk_end = _chunk_end(block_sizes, chunk_start, self._chunk_controller.size)
+            chunk = blocks[chunk_start:chunk_end]
+            chunk_num += 1
+            # Critical chunks (first chunk or the one holding the email content) are
+            # essential for the page to be meaningful
+            is_critical = chunk_start == 0 or (
+                email_content_start_index is not None and chunk_start <= email_content_start_index < chunk_end
+            )
+            chunk_start = chunk_end
+            yield chunk_num, chunk, is_critical
+
+    def _append_blocks_in_chunks(
+        self,
+        page_id: str,
+        blocks: list[dict],
+        block_sizes: list[int],
+        email_content_start_index: Optional[int] = None,
+        start: int = 0,
+    ) -> None:
         """
         Append content blocks in chunks to avoid Notion's limit.
         Uses aggressive retry strategy to maximize success rate - only fails if all retries are exhausted.
+        Chunk size follows the publisher's AIMD controller, so chunks shrink while Notion
+        is throttling or failing and grow back towards the 100-block limit on success.
 
         Args:
             page_id: The Notion page ID.
             blocks: List of block dictionaries to append.
+            block_sizes: Serialized size of each block.
             email_content_start_index: Index of the block that starts email content section (if any).
+            start: Index of the first block to append (earlier ones were sent with the page create).
             
         Raises:
             APIResponseError: Only if all retries are exhausted for critical chunks (first chunk or email content chunk).
         """
-        if not blocks:
+        if len(blocks) <= start:
             return
 
-        chunk_size = 100  # Notion has a limit of 100 blocks per request
         failed_chunks = []
-        total_chunks = (len(blocks) + chunk_size - 1) // chunk_size
         last_exception = None
-        
-        # Calculate which chunk contains the email content
-        email_content_chunk = None
-        if email_content_start_index is not None:
-            email_content_chunk = (email_content_start_index // chunk_size) + 1
-
-        for i in range(0, len(blocks), chunk_size):
-            chunk = blocks[i:i + chunk_size]
-            chunk_num = i // chunk_size + 1
+
+        chunk_num = 0
+        for chunk_num, chunk, is_critical in self._iter_block_chunks(blocks, block_sizes, email_content_start_index, start):
             try:
                 # _append_blocks_with_retry already has retry mechanism (5 attempts with exponential backoff)
                 # If it raises an exception, all retries have been exhausted
                 self._append_blocks_with_retry(page_id, chunk)
-                logger.debug("Successfully appended chunk {}/{} to page {}", chunk_num, total_chunks, page_id)
-            except (APIResponseError, HTTPResponseError, ConnectionError, TimeoutError) as e:
+                self._chunk_controller.on_success()
+                logger.debug("Successfully appended chunk {} ({} blocks) to page {}", chunk_num, len(chunk), page_id)
+            except _RETRYABLE_NOTION_ERRORS as e:
                 # All retries have been exhausted at this point
+                self._chunk_controller.on_failure()
                 error_msg = str(e).replace("{", "{{").replace("}", "}}")
                 logger.error("Failed to append blocks chunk {} to page {} after all retries: {}", chunk_num, page_id, error_msg)
                 failed_chunks.append(chunk_num)
                 last_exception = e
-                
-                # Only raise exception for critical chunks (first chunk or email content chunk)
-                # These are essential for the page to be meaningful
-                is_critical = (chunk_num == 1) or (email_content_chunk and chunk_num == email_content_chunk)
-                
+
                 if is_critical:
                     logger.error("Critical chunk {} failed after all retries - cannot continue", chunk_num)
                     raise
@@ -220,13 +982,43 @@ class NotionPublisher:
                     continue
         
         # If all chunks failed, raise the last exception
-        if len(failed_chunks) == total_chunks and last_exception:
-            logger.error("All {} chunks failed to append to page {} after all retries", total_chunks, page_id)
+        if len(failed_chunks) == chunk_num and last_exception:
+            logger.error("All {} chunks failed to append to page {} after all retries", chunk_num, page_id)
             raise last_exception
         
         # Log summary if some chunks failed but not all
         if failed_chunks:
-            logger.warning("Some chunks failed but page was created: failed chunks: {}/{}", len(failed_chunks), total_chunks)
+            logger.warning("Some chunks failed but page was created: failed chunks: {}/{}", len(failed_chunks), chunk_num)
+
+    def _build_page(self, gist: Gist) -> tuple[dict, list[dict], list[int], Optional[int]]:
+        """
+        Build page properties and content blocks, reusing the result when a gist is re-pushed unchanged.
+        Built payloads are never mutated afterwards, so a cached entry can be sent again as is.
+
+        Args:
+            gist: The Gist object to convert.
+
+        Returns:
+            Tuple of (properties, content blocks, serialized size of each block,
+            index of the email content block or None).
+        """
+        key = gist.original_id
+        signature = _page_signature(gist) if key else 0
+        if key:
+            with self._build_cache_lock:
+                cached = self._build_cache.get(key)
+            if cached and cached[0] == signature:
+                return cached[1]
+
+        blocks, block_sizes, email_content_start_index = _fit_blocks(*self._build_content_blocks(gist))
+        built = (self._build_properties(gist), blocks, block_sizes, email_content_start_index)
+        if key:
+            with self._build_cache_lock:
+                self._build_cache.pop(key, None)
+                if len(self._build_cache) >= NOTION_BUILD_CACHE_SIZE:
+                    del self._build_cache[next(iter(self._build_cache))]
+                self._build_cache[key] = (signature, built)
+        return built
 
     def _build_properties(self, gist: Gist) -> dict:
         """
@@ -263,10 +1055,10 @@ class NotionPublisher:
                     }
                 ]
             },
-            # Tags (multi-select)
+            # Tags (multi-select): truncate and de-duplicate in order, Notion rejects repeated options
             "Tags": {
                 "multi_select": [
-                    {"name": tag} for tag in gist.tags[:10]
+                    {"name": tag} for tag in list(dict.fromkeys(t[:100] for t in gist.tags if t))[:10]
                 ]
             },
         }
@@ -293,7 +1085,7 @@ class NotionPublisher:
 
         return properties
 
-    def _build_content_blocks(self, gist: Gist) -> list[dict]:
+    def _build_content_blocks(self, gist: Gist) -> tuple[list[dict], Optional[int]]:
         """
         Build Notion block objects for page content.
 
@@ -301,88 +1093,60 @@ class NotionPublisher:
             gist: The Gist object with content to convert.
 
         Returns:
-            List of Notion block dictionaries.
+            Tuple of (list of Notion block dictionaries, index of the email content
+            toggle block or None if the gist has no raw content).
         """
         blocks: list[dict] = []
+        email_content_start_index: Optional[int] = None
 
         # Block 1: Summary (if available, show in content area for better readability)
         if gist.summary:
-            blocks.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"type": "text", "text": {"content": "📋 摘要"}}],
-                }
-            })
-            blocks.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [{"type": "text", "text": {"content": _truncate_for_notion(gist.summary)}}],
-                }
-            })
-            blocks.append({
-                "object": "block",
-                "type": "divider",
-                "divider": {}
-            })
+            blocks.extend((
+                _SECTION_HEADINGS["summary"],
+                {
+                    "object": "block",
+                    "type": "paragraph",
+                    "paragraph": {
+                        "rich_text": [{"type": "text", "text": {"content": _truncate_for_notion(gist.summary)}}],
+                    }
+                },
+                _DIVIDER_BLOCK,
+            ))
 
         # Block 2: Key Insights (use proper bulleted list instead of Callout)
         if gist.key_insights:
-            blocks.append({
-                "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"type": "text", "text": {"content": "💡 核心要点"}}],
-                }
-            })
+            blocks.append(_SECTION_HEADINGS["insights"])
             
             # Use proper bulleted_list_item blocks for better structure
-            for insight in gist.key_insights:
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{"type": "text", "text": {"content": _truncate_for_notion(insight)}}],
-                    }
-                })
-            
-            blocks.append({
+            blocks.extend({
                 "object": "block",
-                "type": "divider",
-                "divider": {}
-            })
+                "type": "bulleted_list_item",
+                "bulleted_list_item": {
+                    "rich_text": [{"type": "text", "text": {"content": _truncate_for_notion(insight)}}],
+                }
+            } for insight in gist.key_insights)
+            
+            blocks.append(_DIVIDER_BLOCK)
 
         # Block 3: Mentioned Links (if any)
         if gist.mentioned_links:
-            blocks.append({
+            blocks.append(_SECTION_HEADINGS["links"])
+
+            blocks.extend({
                 "object": "block",
-                "type": "heading_2",
-                "heading_2": {
-                    "rich_text": [{"type": "text", "text": {"content": "📎 相关链接"}}],
+                "type": "bulleted_list_item",
+                "bulleted_list_item": {
+                    "rich_text": [{
+                        "type": "text",
+                        "text": {
+                            "content": link,
+                            "link": {"url": link} if link.startswith("http") else None,
+                        }
+                    }]
                 }
-            })
-
-            for link in gist.mentioned_links[:10]:
-                blocks.append({
-                    "object": "block",
-                    "type": "bulleted_list_item",
-                    "bulleted_list_item": {
-                        "rich_text": [{
-                            "type": "text",
-                            "text": {
-                                "content": _truncate_for_notion(link),
-                                "link": {"url": _truncate_for_notion(link)} if link.startswith("http") else None,
-                            }
-                        }]
-                    }
-                })
+            } for link in map(_truncate_for_notion, gist.mentioned_links[:10]))
             
-            blocks.append({
-                "object": "block",
-                "type": "divider",
-                "divider": {}
-            })
+            blocks.append(_DIVIDER_BLOCK)
 
         # Block 4: Raw Email Content (collapsed in toggle, preserving original email appearance)
         if gist.raw_markdown:
@@ -399,104 +1163,70 @@ class NotionPublisher:
                     "type": "paragraph",
                     "paragraph": {
                         "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": "发件人: "},
-                                "annotations": {"bold": True, "color": "gray"}
-                            },
+                            _SENDER_LABEL,
                             {"type": "text", "text": {"content": gist.sender[:100]}},
                         ]
                     }
                 })
             
             if gist.received_at:
-                from datetime import datetime
-                date_str = gist.received_at.strftime("%Y年%m月%d日 %H:%M") if isinstance(gist.received_at, datetime) else str(gist.received_at)
+                date_str = gist.received_at.strftime(_RECEIVED_AT_FORMAT) if isinstance(gist.received_at, datetime) else str(gist.received_at)
                 toggle_children.append({
                     "object": "block",
                     "type": "paragraph",
                     "paragraph": {
                         "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": "日期: "},
-                                "annotations": {"bold": True, "color": "gray"}
-                            },
+                            _DATE_LABEL,
                             {"type": "text", "text": {"content": date_str}},
                         ]
                     }
                 })
             
             if gist.original_url:
-                url_text = _truncate_for_notion(gist.original_url[:100])
+                # [:100] already keeps the display text well under the 2000-char limit
+                url_text = gist.original_url[:100]
                 url_link = gist.original_url[:2000] if gist.original_url.startswith("http") else None
                 toggle_children.append({
                     "object": "block",
                     "type": "paragraph",
                     "paragraph": {
                         "rich_text": [
-                            {
-                                "type": "text",
-                                "text": {"content": "链接: "},
-                                "annotations": {"bold": True, "color": "gray"}
-                            },
+                            _LINK_LABEL,
                             {
                                 "type": "text",
                                 "text": {"content": url_text, "link": {"url": url_link}} if url_link else {"content": url_text},
-                                "annotations": {"color": "blue"}
+                                "annotations": _LINK_ANNOTATIONS
                             },
                         ]
                     }
                 })
             
             if toggle_children:
-                toggle_children.append({
-                    "object": "block",
-                    "type": "divider",
-                    "divider": {}
-                })
+                toggle_children.append(_DIVIDER_BLOCK)
             
             # Add content blocks inside toggle, preserving original structure
             # Don't convert to quote blocks - keep original formatting for authenticity
             toggle_children.extend(content_blocks)
             
             # Create toggle block with email content (collapsed by default)
+            email_content_start_index = len(blocks)
             blocks.append({
                 "object": "block",
                 "type": "toggle",
                 "toggle": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": "📧 邮件原文（点击展开）"},
-                        "annotations": {"color": "gray", "italic": True}
-                    }],
+                    "rich_text": _EMAIL_TOGGLE_TITLE,
                     "children": toggle_children
                 }
             })
 
         # Block 5: Metadata footer (simplified, since sender is already in Properties)
-        blocks.append({
-            "object": "block",
-            "type": "divider",
-            "divider": {}
-        })
+        blocks.append(_DIVIDER_BLOCK)
 
         # Only show ID if available, sender is redundant (already in Properties)
         if gist.original_id:
-            metadata = f"📧 Message ID: {gist.original_id[:20]}"
-            blocks.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": _truncate_for_notion(metadata)},
-                        "annotations": {"color": "gray", "italic": True}
-                    }]
-                }
-            })
+            blocks.append(_message_id_block(gist.original_id))
 
-        return blocks
+        return blocks, email_content_start_index
 
     def _extract_important_links(self, content: str, original_url: Optional[str] = None) -> list[tuple[str, str]]:
         """
@@ -516,28 +1246,11 @@ class NotionPublisher:
         links: list[tuple[str, str]] = []
         seen_urls: set[str] = set()
         
-        # Noise patterns to exclude
-        noise_patterns = [
-            r'unsubscribe',
-            r'取消订阅',
-            r'退订',
-            r'view.*browser',
-            r'在浏览器中查看',
-            r'twitter\.com',
-            r'facebook\.com',
-            r'linkedin\.com',
-            r'instagram\.com',
-            r'substack\.com/redirect',  # Substack redirect links
-            r'email.*settings',
-            r'privacy.*policy',
-            r'terms.*service',
-        ]
-        
         # Extract Markdown links: [text](url)
-        markdown_links = re.findall(r'\[([^\]]+)\]\(([^)]+)\)', content)
+        markdown_links = _MD_LINK_RE.findall(content)
         for link_text, link_url in markdown_links:
             # Skip noise links
-            if any(re.search(pattern, link_url, re.IGNORECASE) for pattern in noise_patterns):
+            if _NOISE_LINK_RE.search(link_url):
                 continue
             
             # Skip if already seen
@@ -550,14 +1263,13 @@ class NotionPublisher:
                 seen_urls.add(link_url)
         
         # Extract plain URLs
-        url_pattern = r'https?://[^\s\)]+'
-        plain_urls = re.findall(url_pattern, content)
+        plain_urls = _URL_RE.findall(content)
         for url in plain_urls:
             # Clean URL (remove trailing punctuation)
             url = url.rstrip('.,;:!?)')
             
             # Skip noise URLs
-            if any(re.search(pattern, url, re.IGNORECASE) for pattern in noise_patterns):
+            if _NOISE_LINK_RE.search(url):
                 continue
             
             # Skip if already seen
@@ -595,24 +1307,15 @@ class NotionPublisher:
         
         # Minimal cleaning: only remove obvious table separator lines
         # Preserve original email structure as much as possible
-        lines = content.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            stripped = line.strip()
-            # Only skip lines that are purely table separators (no actual content)
-            # Pattern: only contains |, -, :, spaces, and very few other characters
-            if re.match(r'^[\s|:\-]+$', stripped) and len(stripped) > 3:
-                # This is a table separator line, skip it
-                continue
-            cleaned_lines.append(line)
-        content = '\n'.join(cleaned_lines)
+        # Only lines that are purely table separators (|, -, :, spaces) go, in one C-level pass
+        content = _TABLE_SEPARATOR_LINE_RE.sub('', content)
         
         # Only clean up excessive consecutive separators that break readability
         # But preserve single | characters and normal text
         # Replace patterns like "|||||" (5+ consecutive pipes) with single space
-        content = re.sub(r'\|{5,}', ' ', content)
+        content = _PIPE_RUN_RE.sub(' ', content)
         # Replace patterns like "|---|---|" (table separator patterns) with single space
-        content = re.sub(r'\|[\s\-:]{3,}\|', ' ', content)
+        content = _TABLE_SEPARATOR_RE.sub(' ', content)
         
         # Split by double newlines (paragraphs)
         paragraphs = content.split('\n\n')
@@ -622,22 +1325,27 @@ class NotionPublisher:
             if not para:
                 continue
             
+            # Dispatch on the first character so each paragraph pays for at most one
+            # prefix test (headings '#', code '`', bullets '-'/'*', numbered lists digits)
+            first = para[0]
+            
             # Handle headings
-            if para.startswith('#'):
+            if first == '#':
                 level = len(para) - len(para.lstrip('#'))
                 text = para.lstrip('#').strip()
                 if text:
+                    heading_type = _HEADING_TYPES[min(level, 3) - 1]
                     blocks.append({
                         "object": "block",
-                        "type": f"heading_{min(level, 3)}",
-                        f"heading_{min(level, 3)}": {
-                            "rich_text": self._parse_markdown_inline(text)
+                        "type": heading_type,
+                        heading_type: {
+                            "rich_text": _fit_rich_text(self._parse_markdown_inline(text))
                         }
                     })
                 continue
             
             # Handle code blocks
-            if para.startswith('```'):
+            if first == '`' and para.startswith('```'):
                 lines_in_para = para.split('\n')
                 if len(lines_in_para) > 1:
                     code_content = '\n'.join(lines_in_para[1:-1]) if lines_in_para[-1].strip() == '```' else '\n'.join(lines_in_para[1:])
@@ -652,31 +1360,35 @@ class NotionPublisher:
                 continue
             
             # Handle bullet lists
-            if para.strip().startswith('- ') or para.strip().startswith('* '):
-                list_items = [line.strip() for line in para.split('\n') if line.strip().startswith(('- ', '* '))]
-                for item in list_items:
+            if (first == '-' or first == '*') and para.startswith(('- ', '* ')):
+                for line in para.split('\n'):
+                    item = line.strip()
+                    if not item.startswith(('- ', '* ')):
+                        continue
                     item_text = item.lstrip('-* ').strip()
                     if item_text:
                         blocks.append({
                             "object": "block",
                             "type": "bulleted_list_item",
                             "bulleted_list_item": {
-                                "rich_text": self._parse_markdown_inline(item_text)
+                                "rich_text": _fit_rich_text(self._parse_markdown_inline(item_text))
                             }
                         })
                 continue
             
             # Handle numbered lists
-            if re.match(r'^\d+\.\s', para.strip()):
-                list_items = [line.strip() for line in para.split('\n') if re.match(r'^\d+\.\s', line.strip())]
-                for item in list_items:
-                    item_text = re.sub(r'^\d+\.\s+', '', item)
+            if first.isdigit() and _NUMBERED_ITEM_RE.match(para):
+                for line in para.split('\n'):
+                    item = line.strip()
+                    if not (item[:1].isdigit() and _NUMBERED_ITEM_RE.match(item)):
+                        continue
+                    item_text = _NUMBERED_PREFIX_RE.sub('', item)
                     if item_text:
                         blocks.append({
                             "object": "block",
                             "type": "numbered_list_item",
                             "numbered_list_item": {
-                                "rich_text": self._parse_markdown_inline(item_text)
+                                "rich_text": _fit_rich_text(self._parse_markdown_inline(item_text))
                             }
                         })
                 continue
@@ -684,59 +1396,17 @@ class NotionPublisher:
             # Regular paragraph - parse inline Markdown
             rich_text = self._parse_markdown_inline(para)
             if rich_text:
-                # Split into chunks if too long
-                current_chunk = []
-                current_length = 0
-                
-                for item in rich_text:
-                    item_text = item.get("text", {}).get("content", "")
-                    item_length = len(item_text)
-                    
-                    if current_length + item_length <= NOTION_RICH_TEXT_MAX:
-                        current_chunk.append(item)
-                        current_length += item_length
-                    else:
-                        # Flush current chunk
-                        if current_chunk:
-                            blocks.append({
-                                "object": "block",
-                                "type": "paragraph",
-                                "paragraph": {"rich_text": current_chunk}
-                            })
-                        # Start new chunk
-                        if item_length <= NOTION_RICH_TEXT_MAX:
-                            current_chunk = [item]
-                            current_length = item_length
-                        else:
-                            # Item itself is too long, split it
-                            for i in range(0, item_length, NOTION_RICH_TEXT_MAX):
-                                chunk_text = item_text[i:i + NOTION_RICH_TEXT_MAX]
-                                current_chunk = [{
-                                    "type": "text",
-                                    "text": {"content": chunk_text},
-                                    "annotations": item.get("annotations", {})
-                                }]
-                                blocks.append({
-                                    "object": "block",
-                                    "type": "paragraph",
-                                    "paragraph": {"rich_text": current_chunk}
-                                })
-                                current_chunk = []
-                                current_length = 0
-                
-                if current_chunk:
-                    blocks.append({
-                        "object": "block",
-                        "type": "paragraph",
-                        "paragraph": {"rich_text": current_chunk}
-                    })
+                blocks.extend(_paragraph_blocks(rich_text))
         
         return blocks
     
     def _parse_markdown_inline(self, text: str) -> list[dict]:
         """
         Parse inline Markdown formatting (bold, italic, links) into Notion rich_text format.
-        Processes links first, then bold/italic within remaining text.
+        Links are found in one pass; the text between and inside them is scanned
+        for bold/italic in place, emitting final rich_text items directly.
+        Items are not cut to the 2000-char limit; pass them through _paragraph_blocks
+        or _fit_rich_text before sending.
         
         Args:
             text: Text with Markdown formatting.
@@ -747,43 +1417,28 @@ class NotionPublisher:
         if not text:
             return []
         
+        # Fast path: without '[' or '*' neither links nor bold/italic can match
+        if '[' not in text and '*' not in text:
+            return [{"type": "text", "text": {"content": text}}]
+        
         rich_text_items: list[dict] = []
-        i = 0
+        last = 0
+
+        for link_match in _MD_LINK_RE.finditer(text):
+            # Text before link (may contain bold/italic)
+            if link_match.start() > last:
+                _append_inline_spans(rich_text_items, text, last, link_match.start())
+            # Link text, which may itself contain formatting
+            _append_inline_spans(
+                rich_text_items, text, link_match.start(1), link_match.end(1), link_match.group(2), is_link=True
+            )
+            last = link_match.end()
         
-        while i < len(text):
-            # Match links: [text](url) - process links first
-            link_match = re.search(r'\[([^\]]+)\]\(([^)]+)\)', text[i:])
-            if link_match:
-                # Add text before link (may contain bold/italic)
-                before_link = text[i:i + link_match.start()]
-                if before_link:
-                    rich_text_items.extend(self._parse_bold_italic(before_link))
-                
-                # Add link (link text itself may contain formatting, but we'll keep it simple)
-                link_text = link_match.group(1)
-                link_url = link_match.group(2)
-                
-                # Parse formatting within link text
-                link_rich_text = self._parse_bold_italic(link_text)
-                # Apply link to each item
-                for item in link_rich_text:
-                    if item.get("text", {}).get("content"):
-                        item["text"]["link"] = {"url": link_url[:2000]} if link_url.startswith("http") else None
-                        if not item.get("annotations"):
-                            item["annotations"] = {}
-                        item["annotations"]["color"] = "blue"
-                        rich_text_items.append(item)
-                
-                i += link_match.end()
-                continue
-            
-            # No more links, parse remaining text for bold/italic
-            remaining = text[i:]
-            if remaining:
-                rich_text_items.extend(self._parse_bold_italic(remaining))
-            break
+        # No more links, parse remaining text for bold/italic
+        if last < len(text):
+            _append_inline_spans(rich_text_items, text, last, len(text))
         
-        return rich_text_items if rich_text_items else [{"type": "text", "text": {"content": _truncate_for_notion(text)}}]
+        return rich_text_items
     
     def _parse_bold_italic(self, text: str) -> list[dict]:
         """
@@ -795,57 +1450,9 @@ class NotionPublisher:
         Returns:
             List of Notion rich_text items.
         """
-        if not text:
-            return []
-        
         items: list[dict] = []
-        i = 0
-        
-        while i < len(text):
-            # Match bold: **text**
-            bold_match = re.search(r'\*\*([^*]+)\*\*', text[i:])
-            # Match italic: *text* (but not **text**)
-            italic_match = re.search(r'(?<!\*)\*([^*]+)\*(?!\*)', text[i:])
-            
-            # Choose the earliest match
-            matches = []
-            if bold_match:
-                matches.append((bold_match.start(), bold_match.end(), 'bold', bold_match.group(1)))
-            if italic_match:
-                matches.append((italic_match.start(), italic_match.end(), 'italic', italic_match.group(1)))
-            
-            if not matches:
-                # No more formatting, add remaining text
-                remaining = text[i:]
-                if remaining:
-                    items.append({"type": "text", "text": {"content": _truncate_for_notion(remaining)}})
-                break
-            
-            # Sort by position
-            matches.sort(key=lambda x: x[0])
-            match_start, match_end, match_type, match_content = matches[0]
-            
-            # Add text before match
-            before_match = text[i:i + match_start]
-            if before_match:
-                items.append({"type": "text", "text": {"content": _truncate_for_notion(before_match)}})
-            
-            # Add formatted text
-            annotations = {}
-            if match_type == 'bold':
-                annotations["bold"] = True
-            elif match_type == 'italic':
-                annotations["italic"] = True
-            
-            items.append({
-                "type": "text",
-                "text": {"content": _truncate_for_notion(match_content)},
-                "annotations": annotations
-            })
-            
-            i += match_end
-        
-        return items if items else [{"type": "text", "text": {"content": _truncate_for_notion(text)}}]
+        _append_inline_spans(items, text, 0, len(text))
+        return items
     
     def _split_content_to_blocks(self, content: str, max_length: int = NOTION_RICH_TEXT_MAX) -> list[dict]:
         """
@@ -861,34 +1468,60 @@ class NotionPublisher:
         Returns:
             List of paragraph block dictionaries.
         """
-        blocks: list[dict] = []
+        return list(self._iter_content_blocks(content, max_length))
 
-        # Split by paragraphs first to avoid breaking mid-sentence
-        paragraphs = content.split("\n\n")
+    def _iter_content_blocks(self, content: str, max_length: int = NOTION_RICH_TEXT_MAX) -> Iterator[dict]:
+        """
+        Lazily split long content into paragraph blocks, yielding each block as soon
+        as it is complete.
 
-        current_block = ""
-        for para in paragraphs:
-            sep = "\n\n" if current_block else ""
-            if len(current_block) + len(sep) + len(para) <= max_length:
-                current_block += sep + para
+        Args:
+            content: The content to split.
+            max_length: Maximum characters per block (default 2000).
+
+        Yields:
+            Paragraph block dictionaries.
+        """
+        # Single greedy pass over paragraph boundaries ("\n\n") by index. The pending
+        # block is always the contiguous slice content[block_start:block_end], so it is
+        # cut out once on flush instead of being grown by string concatenation.
+        content_len = len(content)
+        has_block = False
+        block_start = block_end = 0
+        pos = 0
+        while True:
+            para_end = content.find("\n\n", pos)
+            if para_end == -1:
+                para_end = content_len
+            para_len = para_end - pos
+
+            if has_block and para_end - block_start <= max_length:
+                block_end = para_end
+            elif not has_block and para_len <= max_length:
+                if para_len:
+                    has_block = True
+                    block_start, block_end = pos, para_end
             else:
                 # Flush current block (guaranteed ≤ max_length)
-                if current_block:
-                    blocks.append(self._create_paragraph_block(current_block))
+                if has_block:
+                    yield self._create_paragraph_block(content[block_start:block_end])
+                    has_block = False
                 # Start new block: cap single paragraph to max_length so we never exceed
-                if len(para) <= max_length:
-                    current_block = para
+                if para_len <= max_length:
+                    if para_len:
+                        has_block = True
+                        block_start, block_end = pos, para_end
                 else:
                     # Force split long paragraph into chunks of at most max_length
-                    for i in range(0, len(para), max_length):
-                        chunk = para[i : i + max_length]
-                        blocks.append(self._create_paragraph_block(chunk))
-                    current_block = ""
+                    for i in range(pos, para_end, max_length):
+                        yield self._create_paragraph_block(content[i:min(i + max_length, para_end)])
 
-        if current_block:
-            blocks.append(self._create_paragraph_block(current_block))
+            if para_end == content_len:
+                break
+            pos = para_end + 2
 
-        return blocks
+        if has_block:
+            yield self._create_paragraph_block(content[block_start:block_end])
 
     def _create_paragraph_block(self, text: str) -> dict:
         """
@@ -900,13 +1533,16 @@ class NotionPublisher:
         Returns:
             Notion paragraph block dictionary.
         """
+        # Chunks from _iter_content_blocks already fit; only oversized text is cut
+        if len(text) > NOTION_RICH_TEXT_MAX:
+            text = _truncate_for_notion(text)
         return {
             "object": "block",
             "type": "paragraph",
             "paragraph": {
                 "rich_text": [{
                     "type": "text",
-                    "text": {"content": _truncate_for_notion(text)}
+                    "text": {"content": text}
                 }]
             }
         }
@@ -921,8 +1557,9 @@ class NotionPublisher:
         try:
             logger.info("Testing Notion connection...")
 
-            # Try to retrieve the database
+            # Try to retrieve the database (always live; refreshes the schema cache)
             database = self.client.databases.retrieve(database_id=self.database_id)
+            self._properties_cache = (time.monotonic(), database.get("properties", {}))
 
             title = database.get("title", [{}])
             title_text = title[0].get("plain_text", "Unknown") if title else "Unknown"
@@ -944,12 +1581,23 @@ class NotionPublisher:
     def get_database_properties(self) -> dict:
         """
         Get the properties of the target Notion database.
+        Served from a cache for NOTION_SCHEMA_CACHE_TTL_SECONDS after each retrieve.
 
         Returns:
             Dictionary of database properties.
         """
+        cached = self._properties_cache
+        if cached and time.monotonic() - cached[0] < NOTION_SCHEMA_CACHE_TTL_SECONDS:
+            return cached[1]
+
         database = self.client.databases.retrieve(database_id=self.database_id)
-        return database.get("properties", {})
+        properties = database.get("properties", {})
+        self._properties_cache = (time.monotonic(), properties)
+        return properties
+
+    def invalidate_properties_cache(self) -> None:
+        """Drop the cached database schema so the next lookup hits the Notion API."""
+        self._properties_cache = None
 
 
 # Property name constants for Notion database schema
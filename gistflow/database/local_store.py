@@ -5,12 +5,46 @@ Records processed Message-IDs to prevent duplicate processing.
 
 import sqlite3
 import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
+# Applied to every new connection. WAL lets readers (web UI) run alongside the
+# pipeline's writes and, with synchronous=NORMAL, commits no longer fsync the
+# database file each time. journal_mode persists in the file; the rest are
+# per-connection settings.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=134217728",  # 128 MB
+    "PRAGMA cache_size=-20000",  # ~20 MB
+)
+
+
+# Stored in PRAGMA user_version once the schema below is in place; bump it
+# whenever _create_schema changes so existing databases pick up the change
+_SCHEMA_VERSION = 2
+
+# Insert a processed email, or update the stored result in place if it was seen
+# before. Unlike INSERT OR REPLACE this doesn't delete and re-insert the row, so
+# its id and processed_at are kept.
+_UPSERT_PROCESSED_SQL = """
+    INSERT INTO processed_emails
+    (message_id, subject, sender, score, is_spam, notion_page_id)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT(message_id) DO UPDATE SET
+        subject = excluded.subject,
+        sender = excluded.sender,
+        score = excluded.score,
+        is_spam = excluded.is_spam,
+        notion_page_id = excluded.notion_page_id
+"""
+
 
 class LocalStore:
     """
@@ -36,7 +70,9 @@ class LocalStore:
             logger.error(f"Failed to create database directory {self.db_path.parent}: {e}")
             raise
 
-        self._conn: Optional[sqlite3.Connection] = None
+        # Message-IDs already in processed_emails, so is_processed needs no query.
+        # All writes to that table go through this class, which keeps it in sync.
+        self._seen_ids: set[str] = set()
         # Initialize thread-local storage
         self._thread_local = threading.local()
         
@@ -63,6 +99,8 @@ class LocalStore:
             try:
                 conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
                 conn.row_factory = sqlite3.Row
+                for pragma in _CONNECTION_PRAGMAS:
+                    conn.execute(pragma)
                 self._thread_local.connection = conn
                 thread_id = threading.get_ident()
                 logger.debug(f"Created database connection for thread {thread_id}")
@@ -72,62 +110,104 @@ class LocalStore:
         
         return conn
 
+    @contextmanager
+    def session(self) -> Iterator[tuple[sqlite3.Connection, sqlite3.Cursor]]:
+        """
+        Run several statements on one connection and cursor as a single transaction.
+
+        The thread-local connection is looked up once. The transaction is committed
+        when the block exits normally and rolled back if it raises.
+
+        Yields:
+            Tuple of (connection, cursor).
+        """
+        conn = self._get_connection()
+        with conn:
+            yield conn, conn.cursor()
+
     def _init_db(self) -> None:
         """Initialize database schema."""
         try:
             conn = self._get_connection()
             cursor = conn.cursor()
 
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS processed_emails (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message_id TEXT UNIQUE NOT NULL,
-                    subject TEXT,
-                    sender TEXT,
-                    processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    score INTEGER,
-                    is_spam BOOLEAN DEFAULT FALSE,
-                    notion_page_id TEXT
-                )
-            """)
-
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_message_id ON processed_emails(message_id)
-            """)
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS processing_errors (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    message_id TEXT NOT NULL,
-                    error_message TEXT,
-                    error_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS prompt_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    prompt_type TEXT NOT NULL,
-                    content TEXT NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    created_by TEXT DEFAULT 'system'
-                )
-            """)
+            # Databases already at the current schema version skip the DDL
+            cursor.execute("PRAGMA user_version")
+            if cursor.fetchone()[0] != _SCHEMA_VERSION:
+                self._create_schema(cursor)
+                conn.commit()
 
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_prompt_type ON prompt_history(prompt_type)
-            """)
-
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_prompt_created_at ON prompt_history(created_at DESC)
-            """)
+            cursor.execute("SELECT message_id FROM processed_emails")
+            self._seen_ids = {row[0] for row in cursor}
 
-            conn.commit()
             logger.info(f"Database initialized at: {self.db_path}")
         except Exception as e:
             logger.error(f"Failed to initialize database at {self.db_path}: {e}")
             raise
 
+    def _create_schema(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Create or upgrade tables and indexes and record the schema version.
+
+        Args:
+            cursor: Cursor on the connection to initialize.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS processed_emails (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT UNIQUE NOT NULL,
+                subject TEXT,
+                sender TEXT,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                score INTEGER,
+                is_spam BOOLEAN DEFAULT FALSE,
+                notion_page_id TEXT
+            )
+        """)
+
+        # message_id is UNIQUE, which already gives it an index; drop the
+        # duplicate one older databases were created with
+        cursor.execute("DROP INDEX IF EXISTS idx_message_id")
+
+        # Covers the is_spam/score aggregates in get_stats, so they scan this
+        # index instead of the table
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_processed_spam_score
+            ON processed_emails(is_spam, score)
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS processing_errors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT NOT NULL,
+                error_message TEXT,
+                error_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS prompt_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                prompt_type TEXT NOT NULL,
+                content TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                created_by TEXT DEFAULT 'system'
+            )
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_prompt_type ON prompt_history(prompt_type)
+        """)
+
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_prompt_created_at ON prompt_history(created_at DESC)
+        """)
+
+        # Gather planner statistics; later opens reuse sqlite_stat1
+        cursor.execute("ANALYZE")
+
+        cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
     def is_processed(self, message_id: str) -> bool:
         """
         Check if an email has already been processed.
@@ -138,15 +218,7 @@ class LocalStore:
         Returns:
             True if already processed, False otherwise.
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute(
-            "SELECT 1 FROM processed_emails WHERE message_id = ?",
-            (message_id,)
-        )
-
-        exists = cursor.fetchone() is not None
+        exists = message_id in self._seen_ids
         if exists:
             logger.debug(f"Email {message_id} already processed, skipping")
         return exists
@@ -175,17 +247,39 @@ class LocalStore:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("""
-                INSERT OR REPLACE INTO processed_emails
-                (message_id, subject, sender, score, is_spam, notion_page_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (message_id, subject, sender, score, is_spam, notion_page_id))
+            cursor.execute(
+                _UPSERT_PROCESSED_SQL,
+                (message_id, subject, sender, score, is_spam, notion_page_id),
+            )
 
             conn.commit()
+            self._seen_ids.add(message_id)
             logger.debug(f"Marked email {message_id} as processed (score={score}, spam={is_spam})")
         except sqlite3.Error as e:
             logger.error(f"Failed to mark email as processed: {e}")
 
+    def mark_processed_many(
+        self,
+        rows: list[tuple[str, str, str, Optional[int], bool, Optional[str]]],
+    ) -> None:
+        """
+        Mark several emails as processed in a single transaction.
+
+        Args:
+            rows: Tuples of (message_id, subject, sender, score, is_spam, notion_page_id).
+        """
+        if not rows:
+            return
+
+        try:
+            with self.session() as (_, cursor):
+                cursor.executemany(_UPSERT_PROCESSED_SQL, rows)
+
+            self._seen_ids.update(row[0] for row in rows)
+            logger.debug(f"Marked {len(rows)} emails as processed")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to mark emails as processed: {e}")
+
     def unmark_processed(self, message_id: str) -> bool:
         """
         Remove an email from processed_emails and processing_errors so it can be
@@ -205,6 +299,7 @@ class LocalStore:
             cursor.execute("DELETE FROM processing_errors WHERE message_id = ?", (message_id,))
             deleted_err = cursor.rowcount
             conn.commit()
+            self._seen_ids.discard(message_id)
             if deleted_pe or deleted_err:
                 logger.info(f"Unmarked {message_id} for reprocess (processed_emails={deleted_pe}, errors={deleted_err})")
             return deleted_pe > 0 or deleted_err > 0
@@ -234,6 +329,27 @@ class LocalStore:
         except sqlite3.Error as e:
             logger.error(f"Failed to record error: {e}")
 
+    def record_error_many(self, errors: list[tuple[str, str]]) -> None:
+        """
+        Record several processing errors in a single transaction.
+
+        Args:
+            errors: Tuples of (message_id, error_message).
+        """
+        if not errors:
+            return
+
+        try:
+            with self.session() as (_, cursor):
+                cursor.executemany("""
+                    INSERT INTO processing_errors (message_id, error_message)
+                    VALUES (?, ?)
+                """, errors)
+
+            logger.warning(f"Recorded {len(errors)} processing errors")
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record errors: {e}")
+
     def clear_all_data(self) -> dict:
         """
         Clear all data from database (processed_emails, processing_errors, prompt_history).
@@ -286,6 +402,7 @@ class LocalStore:
                 pass
             
             conn.commit()
+            self._seen_ids.clear()
             
             logger.warning(f"Cleared all data: {processed_count} processed emails, {errors_count} errors, {prompt_history_count} prompt history records")
             
@@ -309,18 +426,16 @@ class LocalStore:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT COUNT(*) FROM processed_emails")
-        total_processed = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM processed_emails WHERE is_spam = 1")
-        total_spam = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM processing_errors")
-        total_errors = cursor.fetchone()[0]
-
-        cursor.execute("SELECT AVG(score) FROM processed_emails WHERE score IS NOT NULL")
-        avg_score_row = cursor.fetchone()
-        avg_score = round(avg_score_row[0], 1) if avg_score_row[0] else 0.0
+        cursor.execute("""
+            SELECT
+                COUNT(*),
+                COALESCE(SUM(is_spam = 1), 0),
+                AVG(score),
+                (SELECT COUNT(*) FROM processing_errors)
+            FROM processed_emails
+        """)
+        total_processed, total_spam, avg_score, total_errors = cursor.fetchone()
+        avg_score = round(avg_score, 2) if avg_score else 0.0
 
         return {
             "total_processed": total_processed,
@@ -374,33 +489,48 @@ class LocalStore:
         cursor.execute(query, params + [limit, offset])
         
         rows = cursor.fetchall()
-        return [{key: row[key] for key in row.keys()} for row in rows], total_count
+        return [dict(row) for row in rows], total_count
+
+    def get_recent_errors_json(self, limit: int = 100) -> str:
+        """
+        Get the most recent processing errors, encoded as JSON by SQLite.
+
+        Args:
+            limit: Maximum number of errors to return.
+
+        Returns:
+            JSON array text of {message_id, error_message, error_time} objects,
+            newest first.
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+
+        cursor.execute("""
+            SELECT json_group_array(json_object(
+                'message_id', message_id,
+                'error_message', error_message,
+                'error_time', error_time
+            ))
+            FROM (
+                SELECT message_id, error_message, error_time
+                FROM processing_errors
+                ORDER BY error_time DESC
+                LIMIT ?
+            )
+        """, (limit,))
+        return cursor.fetchone()[0]
 
     def close(self) -> None:
         """Close database connection(s)."""
-        # Close thread-local connections
         # Note: We can't iterate over all threads, so we only close the current thread's connection
-        if hasattr(self, '_thread_local'):
-            try:
-                if hasattr(self._thread_local, 'connection') and self._thread_local.connection:
-                    try:
-                        self._thread_local.connection.close()
-                        self._thread_local.connection = None
-                        logger.debug("Thread-local database connection closed")
-                    except Exception as e:
-                        logger.warning(f"Error closing thread-local connection: {e}")
-            except AttributeError:
-                # thread_local may not have connection attribute in this thread
-                pass
-        
-        # Close main connection if exists (for backward compatibility)
-        if self._conn:
+        conn = getattr(self._thread_local, 'connection', None)
+        if conn is not None:
             try:
-                self._conn.close()
-                self._conn = None
-                logger.debug("Main database connection closed")
+                conn.close()
+                self._thread_local.connection = None
+                logger.debug("Thread-local database connection closed")
             except Exception as e:
-                logger.warning(f"Error closing main connection: {e}")
+                logger.warning(f"Error closing thread-local connection: {e}")
 
     def __enter__(self) -> "LocalStore":
         """Context manager entry."""
@@ -455,8 +585,29 @@ class LocalStore:
         Returns:
             List of prompt history records.
         """
+        return list(self.iter_prompt_history(prompt_type=prompt_type, limit=limit))
+
+    def iter_prompt_history(
+        self,
+        prompt_type: Optional[str] = None,
+        limit: int = 50,
+    ) -> Iterator[dict]:
+        """
+        Query prompt history and yield records one at a time.
+
+        The query runs before this returns; rows are fetched from SQLite as
+        the iterator is consumed, so the full history is never held in memory.
+
+        Args:
+            prompt_type: Filter by prompt type ('system' or 'user'). None for all.
+            limit: Maximum number of records to return.
+
+        Returns:
+            Iterator over prompt history records.
+        """
         conn = self._get_connection()
         cursor = conn.cursor()
+        cursor.arraysize = 256
 
         if prompt_type:
             cursor.execute("""
@@ -474,8 +625,7 @@ class LocalStore:
                 LIMIT ?
             """, (limit,))
 
-        rows = cursor.fetchall()
-        return [{key: row[key] for key in row.keys()} for row in rows]
+        return (dict(row) for row in cursor)
 
     def get_prompt_version(self, prompt_id: int) -> Optional[dict]:
         """
@@ -497,4 +647,4 @@ class LocalStore:
         """, (prompt_id,))
 
         row = cursor.fetchone()
-        return {key: row[key] for key in row.keys()} if row else None
\ No newline at end of file
+        return dict(row) if row else None
\ No newline at end of file
@@ -4,9 +4,11 @@ Defines the contract for data flowing through the pipeline.
 """
 
 from datetime import datetime
-from typing import Optional
+from functools import cached_property
+from typing import Any, Optional
 
-from pydantic import BaseModel, Field
+from loguru import logger
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class Gist(BaseModel):
@@ -38,6 +40,43 @@ class Gist(BaseModel):
     notion_page_id: Optional[str] = Field(None, description="Notion page ID after publishing")
     local_file_path: Optional[str] = Field(None, description="Local file path after saving")
 
+    @field_validator("mentioned_links", mode="before")
+    @classmethod
+    def _normalize_links(cls, value: Any) -> Any:
+        """
+        Accept link objects from the LLM (e.g. {"url": ...}) by keeping their URL.
+        Items that are neither strings nor objects with a URL are dropped.
+        """
+        if not isinstance(value, list):
+            return value
+
+        links: list[str] = []
+        for link in value:
+            if isinstance(link, str):
+                links.append(link)
+            elif isinstance(link, dict):
+                # Extract URL from object (could be 'url', 'link', 'href', etc.)
+                url = link.get("url") or link.get("link") or link.get("href") or link.get("value")
+                if url and isinstance(url, str):
+                    links.append(url)
+                else:
+                    logger.warning(f"Skipping link object without valid URL: {link}")
+        return links
+
+    @classmethod
+    def from_trusted(cls, data: dict) -> "Gist":
+        """
+        Build a Gist from pipeline-internal data without running validation.
+        LLM output must still go through normal validation.
+
+        Args:
+            data: Field values already known to match the schema.
+
+        Returns:
+            Gist object.
+        """
+        return cls.model_construct(**data)
+
     def is_valuable(self, min_score: int = 30) -> bool:
         """
         Check if this gist is valuable enough to save to Notion.
@@ -69,6 +108,10 @@ class RawEmail(BaseModel):
     This is the input data structure for the processing pipeline.
     """
 
+    # Read-only once fetched, so derived values are safe to cache. Not hashable:
+    # the list fields make hash() raise TypeError, so key by message_id instead.
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     message_id: str = Field(..., description="Gmail Message-ID (unique identifier)")
     thread_id: Optional[str] = Field(None, description="Gmail Thread-ID")
     subject: str = Field(default="(No Subject)", description="Email subject line")
@@ -80,7 +123,20 @@ class RawEmail(BaseModel):
     labels: list[str] = Field(default_factory=list, description="Gmail labels attached to this email")
     urls: list[str] = Field(default_factory=list, description="Extracted URLs from email content")
 
-    @property
+    @classmethod
+    def from_trusted(cls, data: dict) -> "RawEmail":
+        """
+        Build a RawEmail from pipeline-internal data without running validation.
+
+        Args:
+            data: Field values already known to match the schema.
+
+        Returns:
+            RawEmail object.
+        """
+        return cls.model_construct(**data)
+
+    @cached_property
     def content(self) -> str:
         """Get the best available content (HTML preferred, fall back to text)."""
         if self.html_content:
@@ -91,6 +147,8 @@ class RawEmail(BaseModel):
 class ProcessingResult(BaseModel):
     """Result of processing a single email."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     success: bool = Field(..., description="Whether processing succeeded")
     gist: Optional[Gist] = Field(None, description="Extracted gist if successful")
     error_message: Optional[str] = Field(None, description="Error message if failed")
@@ -101,6 +159,8 @@ class ProcessingResult(BaseModel):
 class NotionPageContent(BaseModel):
     """Structured content for creating a Notion page."""
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     title: str
     properties: dict
     children_blocks: list[dict]
\ No newline at end of file
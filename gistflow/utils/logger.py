@@ -3,32 +3,166 @@ Logging configuration using Loguru.
 Provides a centralized logging setup for the entire application.
 """
 
+import queue
 import sys
-from datetime import timezone, timedelta
+import threading
+import time
+from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
 
 from loguru import logger
 
+_TZ_BEIJING = timezone(timedelta(hours=8))
+_BEIJING_UTC_OFFSET_SECONDS = 8 * 3600
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Shared by console and file handlers; extra[beijing_time] is filled in by the
+# beijing_time_formatter patcher. Loguru parses the template once per handler.
+_LOG_FORMAT = "{extra[beijing_time]} | {level: <8} | {name}:{function}:{line} - {message}"
+
+# (epoch second, formatted time) of the last record; records logged within the
+# same second reuse the string instead of converting and formatting again
+_last_beijing_time: tuple[int, str] = (-1, "")
+
+
+def _beijing_time_str(record_time: datetime) -> str:
+    """Format a record time as Beijing time (UTC+8), cached per second."""
+    global _last_beijing_time
+    second = int(record_time.timestamp())
+    cached_second, cached = _last_beijing_time
+    if second == cached_second:
+        return cached
+    formatted = time.strftime(_TIME_FORMAT, time.gmtime(second + _BEIJING_UTC_OFFSET_SECONDS))
+    _last_beijing_time = (second, formatted)
+    return formatted
+
+
+# File logging goes through a bounded queue and is written in batches
+_LOG_QUEUE_MAXSIZE = 10_000
+_LOG_BATCH_SIZE = 256
+# Records at or above this level are never dropped; they wait this long for
+# queue space and are then written directly
+_LOG_KEEP_LEVEL_NO = logger.level("WARNING").no
+_LOG_KEEP_WAIT_SECONDS = 1.0
+
+# Records carrying this extra key are already-formatted batches on their way to
+# a log file; every other handler ignores them
+_BATCH_KEY = "_gf_batch"
+
+
+def _not_batch(record) -> bool:
+    """Handler filter that skips batch records."""
+    return _BATCH_KEY not in record["extra"]
+
+
+class _BatchingSink:
+    """
+    Loguru sink that buffers formatted messages in a bounded queue. A single writer
+    thread drains up to _LOG_BATCH_SIZE of them at a time and passes each batch to
+    the matching file handler as one raw record, so a batch is one file write.
+
+    When the queue is full, messages below WARNING are dropped (and counted) so a
+    slow disk cannot grow memory without limit. WARNING and above wait briefly for
+    space and, if the queue is still full, are written directly, possibly ahead
+    of older queued messages. Loguru calls stop() when the handler is removed,
+    which flushes whatever is still queued, in order.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+        self._queue: queue.Queue[Optional[str]] = queue.Queue(maxsize=_LOG_QUEUE_MAXSIZE)
+        self._dropped = 0
+        self._dropped_lock = threading.Lock()
+        self._target = logger.bind(**{_BATCH_KEY: name}).opt(raw=True)
+        self._thread = threading.Thread(target=self._run, name=f"log-writer-{name}", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        """Queue a formatted message; see the class docstring for a full queue."""
+        try:
+            self._queue.put_nowait(message)
+            return
+        except queue.Full:
+            pass
+
+        if message.record["level"].no < _LOG_KEEP_LEVEL_NO:
+            with self._dropped_lock:
+                self._dropped += 1
+            return
+
+        try:
+            self._queue.put(message, timeout=_LOG_KEEP_WAIT_SECONDS)
+        except queue.Full:
+            # _not_batch keeps the batch record away from this sink, so this cannot recurse
+            self._target.info(message)
+
+    def stop(self) -> None:
+        """Flush queued messages and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def _run(self) -> None:
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            while len(batch) < _LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                running = False
+                batch = [message for message in batch if message is not None]
+            with self._dropped_lock:
+                dropped, self._dropped = self._dropped, 0
+            if dropped:
+                batch.append(f"[logger] dropped {dropped} log messages (queue full)\n")
+            if batch:
+                self._target.info("".join(batch))
+
+
+def _add_batched_file_handler(
+    name: str, path: Path, level: str, format: str, rotation: str, retention: str
+) -> None:
+    """
+    Log records at or above level to path through a _BatchingSink.
+
+    The batching sink is added before the file handler so that, when loguru
+    removes handlers in order, it is stopped and flushed while the file handler
+    still exists.
+    """
+    logger.add(_BatchingSink(name), level=level, format=format, filter=_not_batch)
+    logger.add(
+        str(path),
+        level=0,
+        format="{message}",
+        filter=lambda record: record["extra"].get(_BATCH_KEY) == name,
+        rotation=rotation,
+        retention=retention,
+        compression="zip",
+        encoding="utf-8",
+    )
+
+
+# Arguments of the last setup_logger call; repeating the same call is a no-op
+_configured_with: Optional[tuple] = None
+
 
 # Custom time formatter for Beijing timezone (UTC+8)
 def beijing_time_formatter(record):
     """Format time in Beijing timezone (UTC+8)"""
-    tz_beijing = timezone(timedelta(hours=8))
-    beijing_time = record["time"].astimezone(tz_beijing)
     # Ensure extra dict exists
     if "extra" not in record:
         record["extra"] = {}
-    record["extra"]["beijing_time"] = beijing_time.strftime("%Y-%m-%d %H:%M:%S")
+    record["extra"]["beijing_time"] = _beijing_time_str(record["time"])
     return record
 
 
 # Custom format function for Beijing time
 def format_beijing_time(record):
     """Format time in Beijing timezone for loguru format string"""
-    tz_beijing = timezone(timedelta(hours=8))
-    beijing_time = record["time"].astimezone(tz_beijing)
-    return beijing_time.strftime("%Y-%m-%d %H:%M:%S")
+    return _beijing_time_str(record["time"])
 
 
 def setup_logger(
@@ -46,76 +180,46 @@ def setup_logger(
         rotation: Log rotation size/time (e.g., "10 MB", "1 day").
         retention: How long to keep old log files.
     """
-    global logger
+    global _configured_with
+
+    # Handlers are only rebuilt when the configuration actually changes
+    config = (log_level, log_dir, rotation, retention)
+    if config == _configured_with:
+        return
+    _configured_with = config
     
     # Remove default handler
     logger.remove()
     
-    # Patch logger to use Beijing timezone (must be done before adding handlers)
-    # This ensures all log records have beijing_time in extra
-    logger = logger.patch(beijing_time_formatter)
-
-    # Console handler with colored output (using Beijing timezone)
-    # Use a format function that directly formats time in Beijing timezone
-    def console_format(record):
-        """Format function for console output with Beijing timezone"""
-        tz_beijing = timezone(timedelta(hours=8))
-        beijing_time = record["time"].astimezone(tz_beijing).strftime("%Y-%m-%d %H:%M:%S")
-        level_name = record["level"].name
-        name = record["name"]
-        function = record["function"]
-        line = record["line"]
-        message = record["message"]
-        # Return formatted string (loguru will handle colorization if colorize=True)
-        return f"{beijing_time} | {level_name: <8} | {name}:{function}:{line} - {message}"
-    
+    # Patch every record with beijing_time (must be done before adding handlers).
+    # configure() sets the patcher on the shared core, so it also applies to
+    # modules that log through loguru's logger directly.
+    logger.configure(patcher=beijing_time_formatter)
+
+    # Console handler (using Beijing timezone). Written synchronously: loguru
+    # already serializes handler writes with a lock, and stdout is cheap
     logger.add(
         sys.stdout,
         level=log_level,
-        format=console_format,
-        colorize=False,  # Disable colorize when using custom format function
-        enqueue=True,  # Enable async logging for thread safety
+        format=_LOG_FORMAT,
+        filter=_not_batch,
+        colorize=False,
     )
 
     # File handler (if log_dir is specified)
     if log_dir:
         log_dir.mkdir(parents=True, exist_ok=True)
         # Use beijing_time for filename as well (format it manually)
-        from datetime import datetime
-        tz_beijing = timezone(timedelta(hours=8))
-        beijing_now = datetime.now(tz_beijing)
+        beijing_now = datetime.now(_TZ_BEIJING)
         date_str = beijing_now.strftime("%Y-%m-%d")
         log_file = log_dir / f"gistflow_{date_str}.log"
 
-        def file_format(record):
-            """Format function for file handlers with Beijing timezone"""
-            tz_beijing = timezone(timedelta(hours=8))
-            beijing_time = record["time"].astimezone(tz_beijing).strftime("%Y-%m-%d %H:%M:%S")
-            return f"{beijing_time} | {record['level'].name: <8} | {record['name']}:{record['function']}:{record['line']} - {record['message']}"
-        
-        logger.add(
-            str(log_file),
-            level=log_level,
-            format=file_format,
-            rotation=rotation,
-            retention=retention,
-            compression="zip",
-            encoding="utf-8",
-            enqueue=True,  # Enable async logging for thread safety
-        )
+        # Written in batches by a background thread (see _BatchingSink)
+        _add_batched_file_handler("app", log_file, log_level, _LOG_FORMAT, rotation, retention)
 
         # Separate error log file
         error_log_file = log_dir / f"gistflow_errors_{date_str}.log"
-        logger.add(
-            str(error_log_file),
-            level="ERROR",
-            format=file_format,
-            rotation=rotation,
-            retention=retention,
-            compression="zip",
-            encoding="utf-8",
-            enqueue=True,  # Enable async logging for thread safety
-        )
+        _add_batched_file_handler("errors", error_log_file, "ERROR", _LOG_FORMAT, rotation, retention)
 
     logger.info(f"Logger initialized with level: {log_level}")
 
@@ -131,7 +235,3 @@ def get_logger(name: str = "gistflow"):
         Logger instance with bound name context.
     """
     return logger.bind(name=name)
-
-
-# Initialize logger on import (can be reconfigured with setup_logger)
-setup_logger(log_level="INFO")
\ No newline at end of file
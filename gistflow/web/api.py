@@ -2,16 +2,211 @@
 Flask REST API for GistFlow web management interface.
 """
 
+import gzip
+import hashlib
+import itertools
 import json
+import os
+import shutil
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import wraps
 from pathlib import Path
 from typing import Optional
+from uuid import uuid4
 
-from flask import Flask, jsonify, request
+import orjson
+from flask import Flask, Response, current_app, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from loguru import logger
 
-from gistflow.config import get_settings, reload_settings
+from gistflow.config import ensure_env_file, get_settings, reload_settings
 from gistflow.database import LocalStore
 
+# Fields whose values are masked in GET /api/config
+_SENSITIVE_FIELDS = [
+    "GMAIL_APP_PASSWORD",
+    "OPENAI_API_KEY",
+    "NOTION_API_KEY",
+]
+
+# Dashboards poll /api/stats; serve the last aggregate for this long
+_STATS_CACHE_TTL_SECONDS = 30
+
+# Response compression; level 1 costs little next to building the JSON
+_GZIP_MIN_SIZE = 1024
+_GZIP_LEVEL = 1
+_GZIP_MIMETYPES = {"application/json", "text/html"}
+
+# How many manual runs GET /api/tasks/run/<job_id> can still report on
+_MAX_TRACKED_RUN_JOBS = 20
+
+_TZ_BEIJING = timezone(timedelta(hours=8))
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson, so jsonify and request.json use its C codec."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        # Hand orjson's bytes straight to the response instead of str round-tripping
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=orjson.OPT_APPEND_NEWLINE),
+            mimetype=self.mimetype,
+        )
+
+
+def _etag_response(payload: bytes, etag: str, mimetype: str) -> Response:
+    """Build a response for a cached payload, or a 304 if the client already has it."""
+    # Weak comparison: gzipped responses carry the weak form of the tag
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(payload, mimetype=mimetype)
+    response.set_etag(etag)
+    return response
+
+
+def _write_file_atomically(path: Path, data: bytes) -> None:
+    """
+    Replace path's contents so readers see either the old or the new file.
+
+    Writes a sibling temp file with the original permissions and renames it over
+    path. Falls back to writing in place when the rename is refused, e.g. when
+    path is a bind-mounted file in Docker.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        tmp_path.write_bytes(data)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Atomic replace of {path} failed ({e}), writing in place")
+        tmp_path.unlink(missing_ok=True)
+        path.write_bytes(data)
+
+
+def _gzip_response(response: Response) -> Response:
+    """Gzip JSON and HTML bodies of at least _GZIP_MIN_SIZE bytes for clients that accept it."""
+    if (
+        response.status_code != 200
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in _GZIP_MIMETYPES
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    if "gzip" not in request.accept_encodings:
+        return response
+
+    body = response.get_data()
+    if len(body) < _GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(body, compresslevel=_GZIP_LEVEL))
+    response.headers["Content-Encoding"] = "gzip"
+    # The encoded bytes differ, so a strong ETag no longer applies to them
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def _pipeline_endpoint(action: str, requires_llm_engine: bool = False) -> Callable:
+    """
+    Decorate a route handler that operates on the pipeline.
+
+    The handler receives the pipeline as its first argument. A 503 is returned
+    when the pipeline isn't available, and uncaught exceptions are logged and
+    returned as a JSON 500.
+
+    Args:
+        action: What the handler does, used in the error log ("stop task").
+        requires_llm_engine: Also require the pipeline to have an llm_engine.
+    """
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            pipeline = current_app.config.get("pipeline")
+            if not pipeline or (requires_llm_engine and not hasattr(pipeline, "llm_engine")):
+                return jsonify({"success": False, "error": "Pipeline not available"}), 503
+            try:
+                return func(pipeline, *args, **kwargs)
+            except Exception as e:
+                logger.exception(f"Failed to {action}: {e}")
+                return jsonify({"success": False, "error": str(e)}), 500
+
+        return wrapper
+
+    return decorator
+
+
+def _stream_json_rows(key: str, rows: Iterable[dict]) -> Iterator[bytes]:
+    """Encode {key: [rows...]} as JSON chunks, one row at a time."""
+    yield b'{"' + key.encode("utf-8") + b'":['
+    separator = b""
+    for row in rows:
+        yield separator + orjson.dumps(row, default=str)
+        separator = b","
+    yield b"]}"
+
+
+def _run_pipeline_once(pipeline) -> dict:
+    """
+    Run one pipeline pass for a manual trigger.
+
+    The caller must already hold pipeline._run_lock; the run releases it. On
+    failure _last_run is marked as failed before the exception is re-raised
+    into the job's future.
+
+    Returns:
+        The run's statistics.
+    """
+    try:
+        return pipeline._run_once_locked()
+    except Exception as e:
+        logger.exception(f"Background task execution failed: {e}")
+        # 更新 _last_run 状态，如果不存在则创建
+        now_beijing = datetime.now(_TZ_BEIJING)
+        if not hasattr(pipeline, "_last_run") or not pipeline._last_run:
+            # 如果 _last_run 不存在，创建一个基本的记录
+            pipeline._last_run = {
+                "started_at": now_beijing.isoformat(),
+                "running": False,
+                "finished_at": now_beijing.isoformat(),
+                "stats": {
+                    "emails_found": 0,
+                    "emails_processed": 0,
+                    "emails_skipped": 0,
+                    "gists_created": 0,
+                    "notion_published": 0,
+                    "local_saved": 0,
+                    "errors": 1,
+                },
+                "phase": "执行失败",
+            }
+        else:
+            # 更新现有的 _last_run
+            pipeline._last_run["running"] = False
+            if not pipeline._last_run.get("finished_at"):
+                pipeline._last_run["finished_at"] = now_beijing.isoformat()
+            pipeline._last_run["phase"] = "执行失败"
+            # 确保 stats 中有错误计数
+            if pipeline._last_run.get("stats"):
+                pipeline._last_run["stats"]["errors"] = pipeline._last_run["stats"].get("errors", 0) + 1
+        raise
+
 
 def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None) -> Flask:
     """
@@ -25,41 +220,53 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
         Configured Flask application.
     """
     app = Flask(__name__, static_folder="static", static_url_path="")
+    app.json = ORJSONProvider(app)
+    app.after_request(_gzip_response)
     app.config["pipeline"] = pipeline_instance
     app.config["local_store"] = local_store
+    app.config["_config_cache"] = None  # (etag, payload) for GET /api/config
+    app.config["_stats_cache"] = None  # (expires_at, stats) for GET /api/stats
+    # Manual runs execute one at a time off the request thread; job_id -> Future
+    app.config["_run_executor"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gf-runonce")
+    app.config["_run_jobs"] = {}
 
     @app.route("/api/health", methods=["GET"])
     def health() -> dict:
         """Health check endpoint."""
         return jsonify({"status": "ok", "service": "GistFlow"})
 
+    def _build_config_payload() -> tuple[str, bytes]:
+        """Serialize the masked config once and derive its ETag from the bytes."""
+        settings = get_settings()
+        config_dict = settings.model_dump()
+
+        # Mask sensitive fields (but keep original for editing)
+        masked_dict = config_dict.copy()
+        for field in _SENSITIVE_FIELDS:
+            if field in masked_dict and masked_dict[field]:
+                masked_dict[field] = "****" + masked_dict[field][-4:] if len(masked_dict[field]) > 4 else "****"
+
+        payload = orjson.dumps({
+            "config": masked_dict,
+            "has_env_file": Path(".env").exists(),
+            "sensitive_fields": _SENSITIVE_FIELDS,  # List of fields that are masked
+        })
+        return hashlib.blake2b(payload, digest_size=8).hexdigest(), payload
+
     @app.route("/api/config", methods=["GET"])
     def get_config() -> dict:
         """Get current configuration (with sensitive fields masked)."""
         try:
-            # Ensure .env file exists
-            from gistflow.config import ensure_env_file
-            ensure_env_file()
-            
-            settings = get_settings()
-            config_dict = settings.model_dump()
-
-            # Mask sensitive fields (but keep original for editing)
-            sensitive_fields = [
-                "GMAIL_APP_PASSWORD",
-                "OPENAI_API_KEY",
-                "NOTION_API_KEY",
-            ]
-            masked_dict = config_dict.copy()
-            for field in sensitive_fields:
-                if field in masked_dict and masked_dict[field]:
-                    masked_dict[field] = "****" + masked_dict[field][-4:] if len(masked_dict[field]) > 4 else "****"
+            cached = app.config.get("_config_cache")
+            if cached is None:
+                # Ensure .env file exists
+                ensure_env_file()
 
-            return jsonify({
-                "config": masked_dict,
-                "has_env_file": Path(".env").exists(),
-                "sensitive_fields": sensitive_fields,  # List of fields that are masked
-            })
+                cached = _build_config_payload()
+                app.config["_config_cache"] = cached
+
+            etag, payload = cached
+            return _etag_response(payload, etag, "application/json")
         except Exception as e:
             logger.exception(f"Failed to get config: {e}")
             return jsonify({"error": str(e), "config": {}, "has_env_file": False}), 500
@@ -73,7 +280,6 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 return jsonify({"success": False, "error": "No data provided"}), 400
 
             # Ensure .env file exists
-            from gistflow.config import ensure_env_file
             ensure_env_file()
 
             env_path = Path(".env")
@@ -96,55 +302,34 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 logger.error(f"Failed to read .env file: {e}")
                 return jsonify({"success": False, "error": f"Failed to read .env file: {e}"}), 500
 
-            # Update values
-            env_dict = {}
-            for line in env_lines:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "=" in line:
-                    key, value = line.split("=", 1)
-                    env_dict[key.strip()] = value.strip()
-
-            # Update with new values
-            # Handle masked passwords: if value is masked (starts with ****), keep original value
-            for key, value in data.items():
-                str_value = str(value)
-                # If the value is masked (starts with ****), don't update it
-                if str_value.startswith("****") and key in env_dict:
-                    continue
-                if key in env_dict:
-                    env_dict[key] = str_value
-                else:
-                    # Add new key
-                    env_dict[key] = str_value
-
-            # Write back to .env
+            # Rewrite matching keys in place, then append keys the file didn't have
+            updates = {str(key): str(value) for key, value in data.items()}
             env_content = []
             for line in env_lines:
                 line_stripped = line.strip()
-                if not line_stripped or line_stripped.startswith("#"):
-                    env_content.append(line)
-                elif "=" in line_stripped:
+                if line_stripped and not line_stripped.startswith("#") and "=" in line_stripped:
                     key = line_stripped.split("=", 1)[0].strip()
-                    if key in env_dict:
-                        env_content.append(f"{key}={env_dict[key]}")
-                        del env_dict[key]
-                    else:
-                        env_content.append(line)
+                    if key in updates:
+                        value = updates.pop(key)
+                        # Masked values (****xxxx) mean "unchanged": keep the original line
+                        if not value.startswith("****"):
+                            env_content.append(f"{key}={value}")
+                            continue
+                env_content.append(line)
 
             # Add any new keys
-            for key, value in env_dict.items():
+            for key, value in updates.items():
                 env_content.append(f"{key}={value}")
 
             # Write with error handling
             try:
-                env_path.write_text("\n".join(env_content), encoding="utf-8")
+                _write_file_atomically(env_path, "\n".join(env_content).encode("utf-8"))
             except Exception as e:
                 logger.error(f"Failed to write .env file: {e}")
                 return jsonify({"success": False, "error": f"Failed to write .env file: {e}"}), 500
 
             # Reload settings with validation
+            app.config["_config_cache"] = None
             try:
                 reload_settings()
             except Exception as e:
@@ -161,19 +346,11 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             return jsonify({"success": False, "error": str(e)}), 500
 
     @app.route("/api/prompts", methods=["GET"])
-    def get_prompts() -> dict:
+    @_pipeline_endpoint("get prompts", requires_llm_engine=True)
+    def get_prompts(pipeline) -> dict:
         """Get current prompts."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline or not hasattr(pipeline, "llm_engine"):
-                return jsonify({"error": "Pipeline not available"}), 503
-
-            prompts = pipeline.llm_engine.get_prompts()
-            return jsonify(prompts)
-
-        except Exception as e:
-            logger.error(f"Failed to get prompts: {e}")
-            return jsonify({"error": str(e)}), 500
+        prompts = pipeline.llm_engine.get_prompts()
+        return jsonify(prompts)
 
     @app.route("/api/prompts", methods=["POST"])
     def update_prompts() -> dict:
@@ -246,83 +423,61 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             return jsonify({"success": False, "error": str(e)}), 500
 
     @app.route("/api/prompts/reload", methods=["POST"])
-    def reload_prompts() -> dict:
+    @_pipeline_endpoint("reload prompts", requires_llm_engine=True)
+    def reload_prompts(pipeline) -> dict:
         """Reload prompts from files."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline or not hasattr(pipeline, "llm_engine"):
-                return jsonify({"error": "Pipeline not available"}), 503
-
-            pipeline.llm_engine.reload_prompts()
-            return jsonify({"success": True, "message": "Prompts reloaded"})
-
-        except Exception as e:
-            logger.error(f"Failed to reload prompts: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+        pipeline.llm_engine.reload_prompts()
+        return jsonify({"success": True, "message": "Prompts reloaded"})
 
     @app.route("/api/prompts/test", methods=["POST"])
-    def test_prompt() -> dict:
+    @_pipeline_endpoint("test prompt", requires_llm_engine=True)
+    def test_prompt(pipeline) -> dict:
         """Test prompt with sample content."""
-        try:
-            data = request.json
-            if not data:
-                return jsonify({"success": False, "error": "No data provided"}), 400
+        data = request.json
+        if not data:
+            return jsonify({"success": False, "error": "No data provided"}), 400
 
-            test_content = data.get("content", "").strip()
-            if not test_content:
-                return jsonify({"success": False, "error": "Test content cannot be empty"}), 400
+        test_content = data.get("content", "").strip()
+        if not test_content:
+            return jsonify({"success": False, "error": "Test content cannot be empty"}), 400
 
-            if len(test_content) > 50000:
-                return jsonify({"success": False, "error": "Test content too long (max 50000 characters)"}), 400
+        if len(test_content) > 50000:
+            return jsonify({"success": False, "error": "Test content too long (max 50000 characters)"}), 400
 
-            sender = data.get("sender", "Test Sender")
-            subject = data.get("subject", "Test Subject")
-            date = data.get("date", "")
+        sender = data.get("sender", "Test Sender")
+        subject = data.get("subject", "Test Subject")
+        date = data.get("date", "")
 
-            pipeline = app.config.get("pipeline")
-            if not pipeline or not hasattr(pipeline, "llm_engine"):
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
+        # Use temporary prompt if provided
+        temp_system = data.get("system_prompt")
+        temp_user = data.get("user_prompt_template")
 
-            # Use temporary prompt if provided
-            temp_system = data.get("system_prompt")
-            temp_user = data.get("user_prompt_template")
-
-            if temp_system or temp_user:
-                # Create temporary engine for testing
-                from gistflow.core import GistEngine
-                from gistflow.config import get_settings
-
-                test_settings = get_settings()
-                test_engine = GistEngine(test_settings)
-                if temp_system:
-                    test_engine._system_prompt = temp_system
-                if temp_user:
-                    test_engine._user_prompt_template = temp_user
-                test_engine.prompt = test_engine._build_prompt()
-            else:
-                test_engine = pipeline.llm_engine
+        if temp_system or temp_user:
+            # Temporary engine for testing; shares the pipeline's LLM client
+            test_engine = pipeline.llm_engine.with_prompts(temp_system, temp_user)
+        else:
+            test_engine = pipeline.llm_engine
 
-            # Extract gist with timeout protection
-            try:
-                gist = test_engine.extract_gist(
-                    content=test_content,
-                    sender=sender,
-                    subject=subject,
-                    date=date,
-                )
-
-                if gist:
-                    return jsonify({"success": True, "gist": gist.model_dump()})
-                else:
-                    return jsonify({"success": False, "error": "Failed to extract gist (LLM returned None)"}), 500
+        # Extract gist with timeout protection
+        try:
+            gist = test_engine.extract_gist(
+                content=test_content,
+                sender=sender,
+                subject=subject,
+                date=date,
+            )
 
-            except Exception as e:
-                logger.exception(f"Error during prompt test: {e}")
-                return jsonify({"success": False, "error": f"Test failed: {str(e)}"}), 500
+            if gist:
+                # Let pydantic-core write the gist JSON and splice it into the envelope
+                # rather than building a dict for jsonify to walk again
+                payload = b'{"success":true,"gist":' + gist.model_dump_json().encode("utf-8") + b"}"
+                return Response(payload, mimetype="application/json")
+            else:
+                return jsonify({"success": False, "error": "Failed to extract gist (LLM returned None)"}), 500
 
         except Exception as e:
-            logger.exception(f"Failed to test prompt: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+            logger.exception(f"Error during prompt test: {e}")
+            return jsonify({"success": False, "error": f"Test failed: {str(e)}"}), 500
 
     @app.route("/api/prompts/history", methods=["GET"])
     def get_prompt_history() -> dict:
@@ -333,29 +488,21 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 return jsonify({"error": "LocalStore not available"}), 503
 
             prompt_type = request.args.get("type")  # 'system' or 'user'
-            limit = int(request.args.get("limit", 50))
-
-            history = local_store.get_prompt_history(prompt_type=prompt_type, limit=limit)
-            # Convert datetime objects to strings for JSON serialization
-            for item in history:
-                if "created_at" in item and item["created_at"]:
-                    created_at = item["created_at"]
-                    if hasattr(created_at, "isoformat"):
-                        item["created_at"] = created_at.isoformat()
-                    elif not isinstance(created_at, str):
-                        item["created_at"] = str(created_at)
-                # Ensure all values are JSON serializable
-                for key, value in list(item.items()):
-                    if value is None:
-                        item[key] = None
-                    elif isinstance(value, (int, float, str, bool)):
-                        pass  # Already serializable
-                    else:
-                        try:
-                            item[key] = str(value)
-                        except Exception:
-                            item[key] = None
-            return jsonify({"history": history})
+            try:
+                limit = int(request.args.get("limit", 50))
+                limit = max(1, min(limit, 100))  # Clamp between 1 and 100
+            except (ValueError, TypeError):
+                limit = 50
+
+            history = local_store.iter_prompt_history(prompt_type=prompt_type, limit=limit)
+            # The status line is sent before the body is streamed, so fetch the first
+            # row here: a failing read still gets a 500 instead of truncated JSON
+            first = next(history, None)
+            if first is not None:
+                history = itertools.chain((first,), history)
+            # Prompts can be large, so encode rows as they come off the cursor
+            # instead of building the whole list
+            return Response(_stream_json_rows("history", history), mimetype="application/json")
 
         except Exception as e:
             logger.error(f"Failed to get prompt history: {e}")
@@ -424,44 +571,32 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             return jsonify({"success": False, "error": str(e)}), 500
 
     @app.route("/api/tasks/status", methods=["GET"])
-    def get_task_status() -> dict:
+    @_pipeline_endpoint("get task status")
+    def get_task_status(pipeline) -> dict:
         """Get task scheduler status and last run details."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"error": "Pipeline not available"}), 503
-
-            scheduler = getattr(pipeline, "scheduler", None)
-            if scheduler:
-                if scheduler.running:
-                    try:
-                        jobs = scheduler.get_jobs()
-                        # APScheduler state: STATE_STOPPED=0, STATE_PAUSED=1, STATE_RUNNING=2
-                        scheduler_state = getattr(scheduler, "state", 0)
-                        is_paused = scheduler_state == 1  # STATE_PAUSED
-                        next_run_time = None
-                        if jobs and jobs[0].next_run_time:
-                            next_run_time = jobs[0].next_run_time.isoformat() if hasattr(jobs[0].next_run_time, 'isoformat') else str(jobs[0].next_run_time)
-                        status = {
-                            "running": True,
-                            "paused": is_paused,
-                            "next_run_time": next_run_time,
-                            "interval_minutes": getattr(pipeline, "settings", None) and getattr(pipeline.settings, "CHECK_INTERVAL_MINUTES", None) or None,
-                            "jobs": [{"id": job.id, "name": job.name, "next_run": str(job.next_run_time)} for job in jobs],
-                        }
-                    except Exception as e:
-                        logger.warning(f"Failed to get scheduler status: {e}")
-                        status = {"running": False, "paused": False, "next_run_time": None, "jobs": []}
-                else:
-                    # 调度器已初始化但未启动，仍返回间隔供前端展示
+        scheduler = getattr(pipeline, "scheduler", None)
+        if scheduler:
+            if scheduler.running:
+                try:
+                    jobs = scheduler.get_jobs()
+                    # APScheduler state: STATE_STOPPED=0, STATE_PAUSED=1, STATE_RUNNING=2
+                    scheduler_state = getattr(scheduler, "state", 0)
+                    is_paused = scheduler_state == 1  # STATE_PAUSED
+                    next_run_time = None
+                    if jobs and jobs[0].next_run_time:
+                        next_run_time = jobs[0].next_run_time.isoformat() if hasattr(jobs[0].next_run_time, 'isoformat') else str(jobs[0].next_run_time)
                     status = {
-                        "running": False,
-                        "paused": False,
-                        "next_run_time": None,
+                        "running": True,
+                        "paused": is_paused,
+                        "next_run_time": next_run_time,
                         "interval_minutes": getattr(pipeline, "settings", None) and getattr(pipeline.settings, "CHECK_INTERVAL_MINUTES", None) or None,
-                        "jobs": [],
+                        "jobs": [{"id": job.id, "name": job.name, "next_run": str(job.next_run_time)} for job in jobs],
                     }
+                except Exception as e:
+                    logger.warning(f"Failed to get scheduler status: {e}")
+                    status = {"running": False, "paused": False, "next_run_time": None, "jobs": []}
             else:
+                # 调度器已初始化但未启动，仍返回间隔供前端展示
                 status = {
                     "running": False,
                     "paused": False,
@@ -469,183 +604,119 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                     "interval_minutes": getattr(pipeline, "settings", None) and getattr(pipeline.settings, "CHECK_INTERVAL_MINUTES", None) or None,
                     "jobs": [],
                 }
-
-            last_run = getattr(pipeline, "_last_run", None)
-            if last_run is not None:
-                status["last_run"] = last_run
-            return jsonify(status)
-
-        except Exception as e:
-            logger.error(f"Failed to get task status: {e}")
-            return jsonify({"error": str(e)}), 500
+        else:
+            status = {
+                "running": False,
+                "paused": False,
+                "next_run_time": None,
+                "interval_minutes": getattr(pipeline, "settings", None) and getattr(pipeline.settings, "CHECK_INTERVAL_MINUTES", None) or None,
+                "jobs": [],
+            }
+
+        last_run = getattr(pipeline, "_last_run", None)
+        if last_run is not None:
+            status["last_run"] = last_run
+        return jsonify(status)
 
     @app.route("/api/tasks/run", methods=["POST"])
-    def run_task() -> dict:
+    @_pipeline_endpoint("run task")
+    def run_task(pipeline) -> dict:
         """Manually trigger a single pipeline run."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
-
-            # 检查是否已有任务在执行
-            is_running = getattr(pipeline, "_is_running", False)
-            last_run = getattr(pipeline, "_last_run", None)
-            
-            # 如果 _is_running 为 True，但 _last_run 显示任务已完成，说明状态不一致，强制重置
-            if is_running and last_run:
-                if not last_run.get("running") and last_run.get("finished_at"):
-                    logger.warning(f"Detected inconsistent state: _is_running=True but _last_run indicates finished. Resetting _is_running.")
-                    pipeline._is_running = False
-                    is_running = False
-            
-            if is_running:
-                return jsonify({
-                    "success": False,
-                    "error": "任务正在执行中，请等待当前任务完成后再试",
-                }), 409  # Conflict
-
-            # 在后台线程中异步执行，避免阻塞 Flask 请求
-            import threading
-            def run_in_background():
-                try:
-                    pipeline.run_once()
-                except Exception as e:
-                    logger.exception(f"Background task execution failed: {e}")
-                    # 确保即使异常也重置运行标志
-                    if hasattr(pipeline, "_is_running"):
-                        pipeline._is_running = False
-                    # 更新 _last_run 状态，如果不存在则创建
-                    from datetime import datetime, timezone, timedelta
-                    def get_beijing_time():
-                        """获取东八区（北京）时间"""
-                        tz_beijing = timezone(timedelta(hours=8))
-                        return datetime.now(tz_beijing)
-                    
-                    if not hasattr(pipeline, "_last_run") or not pipeline._last_run:
-                        # 如果 _last_run 不存在，创建一个基本的记录
-                        now_beijing = get_beijing_time()
-                        pipeline._last_run = {
-                            "started_at": now_beijing.isoformat(),
-                            "running": False,
-                            "finished_at": now_beijing.isoformat(),
-                            "stats": {
-                                "emails_found": 0,
-                                "emails_processed": 0,
-                                "emails_skipped": 0,
-                                "gists_created": 0,
-                                "notion_published": 0,
-                                "local_saved": 0,
-                                "errors": 1,
-                            },
-                            "phase": "执行失败",
-                        }
-                    else:
-                        # 更新现有的 _last_run
-                        from datetime import datetime, timezone, timedelta
-                        def get_beijing_time():
-                            """获取东八区（北京）时间"""
-                            tz_beijing = timezone(timedelta(hours=8))
-                            return datetime.now(tz_beijing)
-                        
-                        pipeline._last_run["running"] = False
-                        if not pipeline._last_run.get("finished_at"):
-                            pipeline._last_run["finished_at"] = get_beijing_time().isoformat()
-                        pipeline._last_run["phase"] = "执行失败"
-                        # 确保 stats 中有错误计数
-                        if pipeline._last_run.get("stats"):
-                            pipeline._last_run["stats"]["errors"] = pipeline._last_run["stats"].get("errors", 0) + 1
-
-            thread = threading.Thread(target=run_in_background, daemon=True)
-            thread.start()
-
+        # 检查是否已有任务在执行；锁由后台任务持有，任务结束时释放
+        if not pipeline._run_lock.acquire(blocking=False):
             return jsonify({
-                "success": True,
-                "message": "任务已启动，正在后台执行。请查看任务页的执行详情了解进度。",
-            })
+                "success": False,
+                "error": "任务正在执行中，请等待当前任务完成后再试",
+            }), 409  # Conflict
 
-        except Exception as e:
-            logger.exception(f"Failed to run task: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+        # 提交到单线程执行器后台执行，避免阻塞 Flask 请求
+        job_id = uuid4().hex
+        jobs = app.config["_run_jobs"]
+        try:
+            future = app.config["_run_executor"].submit(_run_pipeline_once, pipeline)
+        except Exception:
+            pipeline._run_lock.release()
+            raise
+
+        def _release_if_cancelled(done) -> None:
+            # A job cancelled while queued (cleanup cancels pending futures) never runs to release the lock
+            if done.cancelled():
+                pipeline._run_lock.release()
+
+        future.add_done_callback(_release_if_cancelled)
+        jobs[job_id] = future
+        # Only the most recent runs stay pollable
+        while len(jobs) > _MAX_TRACKED_RUN_JOBS:
+            jobs.pop(next(iter(jobs)))
+
+        return jsonify({
+            "success": True,
+            "message": "任务已启动，正在后台执行。请查看任务页的执行详情了解进度。",
+            "job_id": job_id,
+            "status": "queued",
+        }), 202
+
+    @app.route("/api/tasks/run/<job_id>", methods=["GET"])
+    def get_run_job(job_id: str) -> dict:
+        """Get the state of a run started via POST /api/tasks/run."""
+        future = app.config["_run_jobs"].get(job_id)
+        if future is None:
+            return jsonify({"error": "Unknown job_id"}), 404
+
+        if future.running():
+            status = "running"
+        elif not future.done():
+            status = "queued"
+        elif future.cancelled():
+            status = "cancelled"
+        elif future.exception() is not None:
+            return jsonify({"job_id": job_id, "status": "failed", "error": str(future.exception())})
+        else:
+            # The run catches its own errors and only counts them in its stats
+            stats = future.result() or {}
+            status = "failed" if stats.get("errors", 0) > 0 else "done"
+            return jsonify({"job_id": job_id, "status": status, "stats": stats})
+        return jsonify({"job_id": job_id, "status": status})
 
     @app.route("/api/tasks/stop", methods=["POST"])
-    def stop_task() -> dict:
+    @_pipeline_endpoint("stop task")
+    def stop_task(pipeline) -> dict:
         """Stop the scheduler and any currently running task."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
-
-            if pipeline.stop_scheduler():
-                return jsonify({"success": True, "message": "调度器已停止，正在运行的任务也已停止"})
-            return jsonify({"success": False, "error": "调度器未运行"}), 400
+        if pipeline.stop_scheduler():
+            return jsonify({"success": True, "message": "调度器已停止，正在运行的任务也已停止"})
+        return jsonify({"success": False, "error": "调度器未运行"}), 400
 
-        except Exception as e:
-            logger.exception(f"Failed to stop task: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
-    
     @app.route("/api/tasks/stop-current", methods=["POST"])
-    def stop_current_task() -> dict:
+    @_pipeline_endpoint("stop current task")
+    def stop_current_task(pipeline) -> dict:
         """Stop the currently running task (without stopping the scheduler)."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
-
-            if pipeline.stop_current_task():
-                return jsonify({"success": True, "message": "正在运行的任务已停止"})
-            return jsonify({"success": False, "error": "没有正在运行的任务"}), 400
-
-        except Exception as e:
-            logger.exception(f"Failed to stop current task: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+        if pipeline.stop_current_task():
+            return jsonify({"success": True, "message": "正在运行的任务已停止"})
+        return jsonify({"success": False, "error": "没有正在运行的任务"}), 400
 
     @app.route("/api/tasks/pause", methods=["POST"])
-    def pause_task() -> dict:
+    @_pipeline_endpoint("pause task")
+    def pause_task(pipeline) -> dict:
         """Pause the scheduler (jobs won't run, but scheduler stays alive)."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
-
-            if pipeline.pause_scheduler():
-                return jsonify({"success": True, "message": "调度器已暂停"})
-            return jsonify({"success": False, "error": "调度器未运行或已暂停"}), 400
-
-        except Exception as e:
-            logger.exception(f"Failed to pause task: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+        if pipeline.pause_scheduler():
+            return jsonify({"success": True, "message": "调度器已暂停"})
+        return jsonify({"success": False, "error": "调度器未运行或已暂停"}), 400
 
     @app.route("/api/tasks/resume", methods=["POST"])
-    def resume_task() -> dict:
+    @_pipeline_endpoint("resume task")
+    def resume_task(pipeline) -> dict:
         """Resume the scheduler (if paused)."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
-
-            if pipeline.resume_scheduler():
-                return jsonify({"success": True, "message": "调度器已恢复"})
-            return jsonify({"success": False, "error": "调度器未暂停或未运行"}), 400
-
-        except Exception as e:
-            logger.exception(f"Failed to resume task: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+        if pipeline.resume_scheduler():
+            return jsonify({"success": True, "message": "调度器已恢复"})
+        return jsonify({"success": False, "error": "调度器未暂停或未运行"}), 400
 
     @app.route("/api/tasks/start", methods=["POST"])
-    def start_task() -> dict:
+    @_pipeline_endpoint("start scheduler")
+    def start_task(pipeline) -> dict:
         """Start the scheduler (if not already running)."""
-        try:
-            pipeline = app.config.get("pipeline")
-            if not pipeline:
-                return jsonify({"success": False, "error": "Pipeline not available"}), 503
-
-            if pipeline.start_scheduler():
-                return jsonify({"success": True, "message": "调度器已启动，将按配置的间隔自动执行任务"})
-            return jsonify({"success": False, "error": "调度器已在运行"}), 400
-
-        except Exception as e:
-            logger.exception(f"Failed to start scheduler: {e}")
-            return jsonify({"success": False, "error": str(e)}), 500
+        if pipeline.start_scheduler():
+            return jsonify({"success": True, "message": "调度器已启动，将按配置的间隔自动执行任务"})
+        return jsonify({"success": False, "error": "调度器已在运行"}), 400
 
     @app.route("/api/tasks/history", methods=["GET"])
     def get_task_history() -> dict:
@@ -678,36 +749,12 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 offset=offset, 
                 search=search
             )
-            
-            # Convert datetime objects to strings for JSON serialization
-            for item in history:
-                if "processed_at" in item and item["processed_at"]:
-                    processed_at = item["processed_at"]
-                    if hasattr(processed_at, "isoformat"):
-                        item["processed_at"] = processed_at.isoformat()
-                    elif isinstance(processed_at, str):
-                        # Already a string, keep as is
-                        pass
-                    else:
-                        # Try to convert to string
-                        item["processed_at"] = str(processed_at)
-                # Ensure all values are JSON serializable
-                for key, value in list(item.items()):
-                    if value is None:
-                        item[key] = None
-                    elif isinstance(value, (int, float, str, bool)):
-                        pass  # Already serializable
-                    else:
-                        try:
-                            # Try to convert to string
-                            item[key] = str(value)
-                        except Exception:
-                            # If conversion fails, set to None
-                            item[key] = None
-            
+
             total_pages = (total_count + limit - 1) // limit if total_count > 0 else 1
             
-            return jsonify({
+            # Rows hold plain SQLite values; anything orjson can't encode natively
+            # (e.g. a BLOB) goes through str()
+            payload = orjson.dumps({
                 "history": history,
                 "pagination": {
                     "page": page,
@@ -715,7 +762,8 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                     "total": total_count,
                     "total_pages": total_pages
                 }
-            })
+            }, default=str)
+            return Response(payload, mimetype="application/json")
 
         except Exception as e:
             logger.exception(f"Failed to get task history: {e}")
@@ -729,48 +777,16 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             if not local_store:
                 return jsonify({"error": "LocalStore not available"}), 503
 
-            conn = local_store._get_connection()
-            cursor = conn.cursor()
-
             try:
-                cursor.execute("""
-                    SELECT message_id, error_message, error_time
-                    FROM processing_errors
-                    ORDER BY error_time DESC
-                    LIMIT 100
-                """)
-                rows = cursor.fetchall()
+                errors_json = local_store.get_recent_errors_json(limit=100)
             except Exception as e:
                 logger.warning(f"Failed to query processing_errors table: {e}")
                 # Table might not exist yet, return empty list
                 return jsonify({"errors": []})
 
-            errors = []
-            for row in rows:
-                try:
-                    error_dict = {key: row[key] for key in row.keys()}
-                    # Convert datetime to string if present
-                    if "error_time" in error_dict and error_dict["error_time"]:
-                        error_time = error_dict["error_time"]
-                        if hasattr(error_time, "isoformat"):
-                            error_dict["error_time"] = error_time.isoformat()
-                        elif not isinstance(error_time, str):
-                            error_dict["error_time"] = str(error_time)
-                    # Ensure all values are JSON serializable
-                    for key, value in list(error_dict.items()):
-                        if value is None:
-                            error_dict[key] = None
-                        elif not isinstance(value, (int, float, str, bool)):
-                            try:
-                                error_dict[key] = str(value)
-                            except Exception:
-                                error_dict[key] = None
-                    errors.append(error_dict)
-                except Exception as e:
-                    logger.warning(f"Failed to process error row: {e}")
-                    continue
-
-            return jsonify({"errors": errors})
+            # SQLite already built the array; just wrap it
+            payload = b'{"errors":' + errors_json.encode("utf-8") + b"}"
+            return Response(payload, mimetype="application/json")
 
         except Exception as e:
             logger.exception(f"Failed to get task errors: {e}")
@@ -793,6 +809,9 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 return jsonify({"success": False, "error": "LocalStore not available"}), 503
 
             if local_store.unmark_processed(message_id):
+                pipeline = app.config.get("pipeline")
+                if pipeline and getattr(pipeline, "notion_publisher", None):
+                    pipeline.notion_publisher.forget_published(message_id)
                 return jsonify({
                     "success": True,
                     "message": "已移除失败记录，下次运行将重新拉取并处理该邮件。",
@@ -833,10 +852,20 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 last_run["running"] = False
                 last_run["phase"] = "已强制重置"
             
-            logger.warning(f"Task state forcefully reset (was_running={was_running})")
+            # The run lock is only released by the run itself, so a new run can
+            # start once the interrupted one reaches its next check point
+            run_lock = getattr(pipeline, "_run_lock", None)
+            still_running = run_lock is not None and run_lock.locked()
+
+            logger.warning(f"Task state forcefully reset (was_running={was_running}, still_running={still_running})")
+            if still_running:
+                message = "任务状态已重置，已请求中断正在执行的任务，任务退出后即可重新启动"
+            else:
+                message = "任务状态已重置，现在可以重新启动任务了"
             return jsonify({
                 "success": True,
-                "message": "任务状态已重置，正在执行的任务将被中断。现在可以重新启动任务了",
+                "message": message,
+                "can_restart": not still_running,
             })
 
         except Exception as e:
@@ -860,6 +889,9 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
                 return jsonify({"success": False, "error": "LocalStore not available"}), 503
 
             if local_store.unmark_processed(message_id):
+                pipeline = app.config.get("pipeline")
+                if pipeline and getattr(pipeline, "notion_publisher", None):
+                    pipeline.notion_publisher.forget_published(message_id)
                 return jsonify({
                     "success": True,
                     "message": "已移除处理记录，下次运行将重新拉取并处理该邮件。",
@@ -881,83 +913,14 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             if not local_store:
                 return jsonify({"error": "LocalStore not available"}), 503
 
-            # Get basic stats from database
-            conn = local_store._get_connection()
-            cursor = conn.cursor()
-
-            # Initialize default values
-            total_processed = 0
-            total_spam = 0
-            avg_score = 0.0
-            total_errors = 0
-
-            # Check if tables exist first
-            try:
-                cursor.execute("""
-                    SELECT name FROM sqlite_master 
-                    WHERE type='table' AND name IN ('processed_emails', 'processing_errors')
-                """)
-                existing_tables = {row[0] for row in cursor.fetchall()}
-            except Exception as e:
-                logger.warning(f"Failed to check tables: {e}")
-                existing_tables = set()
-
-            # Get total processed
-            if 'processed_emails' in existing_tables:
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM processed_emails")
-                    result = cursor.fetchone()
-                    total_processed = int(result[0]) if result and result[0] is not None else 0
-                except Exception as e:
-                    logger.warning(f"Failed to get total_processed: {e}")
-                    total_processed = 0
-            else:
-                logger.debug("processed_emails table does not exist yet")
-
-            # Get total spam
-            if 'processed_emails' in existing_tables:
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM processed_emails WHERE is_spam = 1")
-                    result = cursor.fetchone()
-                    total_spam = int(result[0]) if result and result[0] is not None else 0
-                except Exception as e:
-                    logger.warning(f"Failed to get total_spam: {e}")
-                    total_spam = 0
-
-            # Get average score
-            if 'processed_emails' in existing_tables:
-                try:
-                    cursor.execute("SELECT AVG(score) FROM processed_emails WHERE score IS NOT NULL")
-                    result = cursor.fetchone()
-                    if result and result[0] is not None:
-                        try:
-                            avg_score = float(result[0])
-                        except (ValueError, TypeError):
-                            avg_score = 0.0
-                    else:
-                        avg_score = 0.0
-                except Exception as e:
-                    logger.warning(f"Failed to get avg_score: {e}")
-                    avg_score = 0.0
+            cached = app.config.get("_stats_cache")
+            now = time.monotonic()
+            if cached is not None and cached[0] > now:
+                return jsonify(cached[1])
 
-            # Get total errors
-            if 'processing_errors' in existing_tables:
-                try:
-                    cursor.execute("SELECT COUNT(*) FROM processing_errors")
-                    result = cursor.fetchone()
-                    total_errors = int(result[0]) if result and result[0] is not None else 0
-                except Exception as e:
-                    logger.warning(f"Failed to get total_errors: {e}")
-                    total_errors = 0
-            else:
-                logger.debug("processing_errors table does not exist yet")
-
-            return jsonify({
-                "total_processed": total_processed,
-                "total_spam": total_spam,
-                "avg_score": round(avg_score, 2),
-                "total_errors": total_errors,
-            })
+            stats = local_store.get_stats()
+            app.config["_stats_cache"] = (now + _STATS_CACHE_TTL_SECONDS, stats)
+            return jsonify(stats)
 
         except Exception as e:
             logger.exception(f"Failed to get stats: {e}")
@@ -982,6 +945,7 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             
             # Clear database
             db_result = local_store.clear_all_data()
+            app.config["_stats_cache"] = None
             
             # Clear local files
             file_result = {"files_deleted": 0, "message": "Local storage disabled"}
@@ -994,6 +958,8 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             
             # Reset pipeline state
             if pipeline:
+                if getattr(pipeline, "notion_publisher", None):
+                    pipeline.notion_publisher.forget_published()
                 if hasattr(pipeline, "_last_run"):
                     pipeline._last_run = None
                 if hasattr(pipeline, "_is_running"):
@@ -1012,12 +978,19 @@ def create_app(pipeline_instance=None, local_store: Optional[LocalStore] = None)
             logger.exception(f"Failed to clear data: {e}")
             return jsonify({"success": False, "error": str(e)}), 500
 
+    # The UI is a single static page; read it once instead of on every load
+    ui_path = Path(__file__).parent / "static" / "index.html"
+    if ui_path.exists():
+        ui_bytes = ui_path.read_bytes()
+    else:
+        ui_bytes = b"<h1>GistFlow Web Interface</h1><p>UI not found. Please check static/index.html</p>"
+    ui_etag = hashlib.blake2b(ui_bytes, digest_size=8).hexdigest()
+
     @app.route("/", methods=["GET"])
-    def index() -> str:
+    def index() -> Response:
         """Serve web UI."""
-        ui_path = Path(__file__).parent / "static" / "index.html"
-        if ui_path.exists():
-            return ui_path.read_text(encoding="utf-8")
-        return "<h1>GistFlow Web Interface</h1><p>UI not found. Please check static/index.html</p>"
+        response = _etag_response(ui_bytes, ui_etag, "text/html; charset=utf-8")
+        response.headers["Cache-Control"] = "no-cache"
+        return response
 
     return app
@@ -29,7 +29,6 @@ from gistflow.models import Gist, RawEmail
 from gistflow.utils import setup_logger
 from gistflow.web import create_app
 
-
 def get_beijing_time() -> datetime:
     """获取东八区（北京）时间"""
     tz_beijing = timezone(timedelta(hours=8))
@@ -72,8 +71,10 @@ class GistFlowPipeline:
         self._shutdown_requested = False
         self.scheduler: Optional[BackgroundScheduler] = None
         self._web_thread: Optional[threading.Thread] = None
+        self._web_app = None  # Flask app, kept so cleanup can stop its task executor
         self._last_run: Optional[dict] = None  # 最近一次执行的详情，供 Web 展示
-        self._is_running: bool = False  # 防止并发执行 run_once
+        self._is_running: bool = False  # 是否有任务在执行，供状态展示
+        self._run_lock = threading.Lock()  # 防止并发执行 run_once
         self._setup_signal_handlers()
 
         # Log publisher status
@@ -223,7 +224,7 @@ class GistFlowPipeline:
             Dictionary with execution statistics.
         """
         # 防止并发执行
-        if self._is_running:
+        if not self._run_lock.acquire(blocking=False):
             logger.warning("Pipeline is already running, skipping this request")
             return {
                 "started_at": datetime.now().isoformat(),
@@ -239,7 +240,15 @@ class GistFlowPipeline:
                 "finished_at": datetime.now().isoformat(),
                 "error_message": "任务正在执行中，请稍后再试",
             }
-        
+        return self._run_once_locked()
+
+    def _run_once_locked(self) -> dict:
+        """
+        Body of run_once. The caller must hold _run_lock; it is released on return.
+
+        Returns:
+            Dictionary with execution statistics.
+        """
         self._is_running = True
         try:
             # 使用东八区时间（UTC+8）
@@ -316,7 +325,8 @@ class GistFlowPipeline:
                             if gist:
                                 stats["emails_processed"] += 1
 
-                                # Mark as processed in local store
+                                # Mark as processed in local store before Gmail, so an email that
+                                # was published always has its row even if the run dies next
                                 try:
                                     self.local_store.mark_processed(
                                         message_id=email.message_id,
@@ -396,6 +406,7 @@ class GistFlowPipeline:
             return stats
         finally:
             self._is_running = False
+            self._run_lock.release()
 
     def start_web_server(self) -> None:
         """
@@ -403,6 +414,7 @@ class GistFlowPipeline:
         """
         try:
             app = create_app(pipeline_instance=self, local_store=self.local_store)
+            self._web_app = app
             host = self.settings.WEB_SERVER_HOST
             port = self.settings.WEB_SERVER_PORT
 
@@ -666,6 +678,9 @@ class GistFlowPipeline:
 
     def cleanup(self) -> None:
         """Cleanup resources."""
+        if self._web_app is not None:
+            # Drop queued manual runs; a running one stops via _shutdown_requested
+            self._web_app.config["_run_executor"].shutdown(wait=False, cancel_futures=True)
         self.local_store.close()
 
 
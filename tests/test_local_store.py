@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Local store test script.
+Exercises the SQLite-backed LocalStore against temporary databases.
+"""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gistflow.database import LocalStore
+from gistflow.database.local_store import _SCHEMA_VERSION
+
+
+def _processed_row(db_path: Path, message_id: str) -> Optional[dict]:
+    """Read a processed_emails row straight from the database file."""
+    conn = sqlite3.connect(str(db_path))
+    conn.row_factory = sqlite3.Row
+    try:
+        row = conn.execute("SELECT * FROM processed_emails WHERE message_id = ?", (message_id,)).fetchone()
+        return dict(row) if row else None
+    finally:
+        conn.close()
+
+
+def test_upsert_updates_in_place() -> None:
+    """Test that re-marking an email updates its row instead of replacing it."""
+    print("\n" + "=" * 60)
+    print("Testing Processed Email Upsert")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "store.db"
+        store = LocalStore(db_path)
+
+        store.mark_processed("msg-1", subject="first", sender="a", score=10, is_spam=True)
+        before = _processed_row(db_path, "msg-1")
+        store.mark_processed("msg-1", subject="second", sender="b", score=80, notion_page_id="page-1")
+        after = _processed_row(db_path, "msg-1")
+        print(f"\n  Before: {before}\n  After:  {after}")
+
+        assert after["id"] == before["id"]
+        assert after["processed_at"] == before["processed_at"]
+        assert (after["subject"], after["sender"], after["score"]) == ("second", "b", 80)
+        assert not after["is_spam"]
+        assert after["notion_page_id"] == "page-1"
+        assert store.get_stats()["total_processed"] == 1
+        store.close()
+
+    print("\n✅ Upsert test passed!")
+
+
+def test_batch_writes() -> None:
+    """Test mark_processed_many and record_error_many."""
+    print("\n" + "=" * 60)
+    print("Testing Batched Writes")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "store.db"
+        store = LocalStore(db_path)
+        store.mark_processed("msg-0", subject="old", score=5)
+
+        store.mark_processed_many([
+            ("msg-0", "updated", "x", 50, False, "page-0"),
+            ("msg-1", "one", "x", 70, False, None),
+            ("msg-2", "two", "y", 20, True, None),
+            ("msg-1", "one again", "x", 75, False, "page-1"),
+        ])
+        store.mark_processed_many([])
+
+        for message_id in ("msg-0", "msg-1", "msg-2"):
+            assert store.is_processed(message_id)
+        assert _processed_row(db_path, "msg-0")["subject"] == "updated"
+        assert _processed_row(db_path, "msg-1")["score"] == 75
+        stats = store.get_stats()
+        print(f"\n  Stats: {stats}")
+        assert stats["total_processed"] == 3
+        assert stats["total_spam"] == 1
+
+        store.record_error_many([("msg-3", "timeout"), ("msg-4", "bad json"), ("msg-3", "timeout again")])
+        store.record_error_many([])
+        assert store.get_stats()["total_errors"] == 3
+        # Errors alone do not mark an email as processed
+        assert not store.is_processed("msg-3")
+        store.close()
+
+    print("\n✅ Batched writes test passed!")
+
+
+def test_seen_ids_stay_in_sync() -> None:
+    """Test that is_processed follows unmark_processed, clear_all_data and reopening."""
+    print("\n" + "=" * 60)
+    print("Testing In-Memory Message-ID Set")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "store.db"
+        store = LocalStore(db_path)
+        store.mark_processed("msg-1")
+        store.mark_processed_many([("msg-2", "", "", None, False, None), ("msg-3", "", "", None, False, None)])
+
+        assert store.unmark_processed("msg-2")
+        assert not store.is_processed("msg-2")
+        assert not store.unmark_processed("msg-2")
+        assert store.is_processed("msg-1") and store.is_processed("msg-3")
+
+        # A new instance loads the set from the database
+        reopened = LocalStore(db_path)
+        assert reopened._seen_ids == {"msg-1", "msg-3"}
+        reopened.close()
+
+        result = store.clear_all_data()
+        print(f"\n  Cleared: {result}")
+        assert result["processed_emails_deleted"] == 2
+        assert not store.is_processed("msg-1") and not store.is_processed("msg-3")
+        assert store._seen_ids == set()
+
+        store.mark_processed("msg-1")
+        assert store.is_processed("msg-1")
+        store.close()
+
+    print("\n✅ Message-ID set test passed!")
+
+
+def test_schema_migration() -> None:
+    """Test that a database without a schema version is upgraded to the current one."""
+    print("\n" + "=" * 60)
+    print("Testing Schema Migration")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "legacy.db"
+
+        # Schema as created before user_version was tracked (version 0)
+        conn = sqlite3.connect(str(db_path))
+        conn.executescript("""
+            CREATE TABLE processed_emails (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT UNIQUE NOT NULL,
+                subject TEXT,
+                sender TEXT,
+                processed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                score INTEGER,
+                is_spam BOOLEAN DEFAULT FALSE,
+                notion_page_id TEXT
+            );
+            CREATE INDEX idx_message_id ON processed_emails(message_id);
+            CREATE TABLE processing_errors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                message_id TEXT NOT NULL,
+                error_message TEXT,
+                error_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            INSERT INTO processed_emails (message_id, subject, score) VALUES ('legacy-1', 'old', 60);
+        """)
+        conn.close()
+
+        store = LocalStore(db_path)
+        store.close()
+
+        conn = sqlite3.connect(str(db_path))
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        conn.close()
+        print(f"\n  user_version={version}, indexes={sorted(indexes)}")
+
+        assert version == _SCHEMA_VERSION
+        assert "idx_message_id" not in indexes
+        assert {"idx_processed_spam_score", "idx_prompt_type", "idx_prompt_created_at"} <= indexes
+        assert "prompt_history" in tables
+
+        # Existing rows survive the upgrade, and a second open skips the DDL
+        store = LocalStore(db_path)
+        assert store.is_processed("legacy-1")
+        assert store.get_stats()["total_processed"] == 1
+        store.close()
+
+    print("\n✅ Schema migration test passed!")
+
+
+def main() -> None:
+    """Run all tests."""
+    print("=" * 60)
+    print("GistFlow Local Store Tests")
+    print("=" * 60)
+
+    test_upsert_updates_in_place()
+    test_batch_writes()
+    test_seen_ids_stay_in_sync()
+    test_schema_migration()
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Logger test script.
+Exercises the batching file sink: flush order on stop and behaviour when its queue is full.
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from loguru import logger
+
+from gistflow.utils import logger as logger_module
+
+
+class _RecordingTarget:
+    """Stands in for the file handler; optionally blocks until released."""
+
+    def __init__(self, gate: threading.Event = None) -> None:
+        self.gate = gate
+        self.written: list = []
+
+    def info(self, text: str) -> None:
+        if self.gate is not None:
+            self.gate.wait()
+        self.written.append(text)
+
+
+def _add_test_sink(target: _RecordingTarget) -> tuple:
+    """Add a _BatchingSink writing to target; returns (handler id, bound logger)."""
+    sink = logger_module._BatchingSink("test")
+    sink._target = target
+    handler_id = logger.add(
+        sink, level="DEBUG", format="{level}:{message}", filter=lambda record: record["extra"].get("sink_test")
+    )
+    return handler_id, logger.bind(sink_test=True)
+
+
+def test_stop_flushes_in_order() -> None:
+    """Test that removing the handler flushes every queued message in logging order."""
+    print("\n" + "=" * 60)
+    print("Testing Batching Sink Flush on Stop")
+    print("=" * 60)
+
+    target = _RecordingTarget()
+    handler_id, test_logger = _add_test_sink(target)
+    for i in range(2000):
+        test_logger.log("WARNING" if i % 7 == 0 else "INFO", f"m{i}")
+    logger.remove(handler_id)  # calls _BatchingSink.stop()
+
+    lines = "".join(target.written).splitlines()
+    print(f"\n  {len(lines)} lines in {len(target.written)} batches")
+    assert [line.split(":", 1)[1] for line in lines] == [f"m{i}" for i in range(2000)]
+    print("\n✅ Flush on stop test passed!")
+
+
+def test_full_queue_keeps_warnings() -> None:
+    """Test that a full queue drops low-level messages but never WARNING or above."""
+    print("\n" + "=" * 60)
+    print("Testing Batching Sink With a Full Queue")
+    print("=" * 60)
+
+    original_maxsize = logger_module._LOG_QUEUE_MAXSIZE
+    logger_module._LOG_QUEUE_MAXSIZE = 4
+    gate = threading.Event()
+    target = _RecordingTarget(gate)
+    try:
+        handler_id, test_logger = _add_test_sink(target)
+        # The writer thread takes "first" and blocks on the gate; the next four fill the queue
+        test_logger.info("first")
+        for i in range(4):
+            test_logger.info(f"queued{i}")
+        test_logger.debug("dropped0")
+        test_logger.info("dropped1")
+
+        # The warning waits for space, which frees up once the writer is released
+        threading.Timer(0.2, gate.set).start()
+        test_logger.warning("kept")
+        logger.remove(handler_id)
+    finally:
+        logger_module._LOG_QUEUE_MAXSIZE = original_maxsize
+        gate.set()
+
+    text = "".join(target.written)
+    print(f"\n  Written:\n{text}")
+    assert "dropped0" not in text and "dropped1" not in text
+    assert "dropped 2 log messages" in text
+    messages = [line.split(":", 1)[1] for line in text.splitlines() if not line.startswith("[logger]")]
+    assert messages == ["first", "queued0", "queued1", "queued2", "queued3", "kept"]
+    print("\n✅ Full queue test passed!")
+
+
+def main() -> None:
+    """Run all tests."""
+    print("=" * 60)
+    print("GistFlow Logger Tests")
+    print("=" * 60)
+
+    test_stop_flushes_in_order()
+    test_full_queue_keeps_warnings()
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
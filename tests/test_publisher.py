@@ -4,15 +4,32 @@ Notion Publisher test script.
 Tests the ability to create pages in Notion database.
 """
 
+import functools
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
+import httpx
+import orjson
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+from tenacity import stop_after_attempt, wait_none
+
 from gistflow.config import get_settings
 from gistflow.core import NotionPublisher
+from gistflow.core.publisher import (
+    NOTION_MAX_BLOCK_BYTES,
+    AimdController,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimiter,
+    NOTION_MAX_REQUEST_BYTES,
+    _chunk_end,
+    _fit_blocks,
+)
 from gistflow.models import Gist
 from gistflow.utils import get_logger, setup_logger
 
@@ -149,7 +166,7 @@ def test_build_content_blocks() -> None:
         publisher = NotionPublisher(settings)
         gist = create_test_gist()
 
-        blocks = publisher._build_content_blocks(gist)
+        blocks, _ = publisher._build_content_blocks(gist)
 
         print(f"\n📝 Generated {len(blocks)} content blocks:")
         for i, block in enumerate(blocks, 1):
@@ -273,6 +290,336 @@ def test_spam_filtering() -> None:
         print(f"\n❌ Spam filtering test error: {e}")
 
 
+def _text_block(content: str) -> dict:
+    """Build a single-segment paragraph block."""
+    return {"object": "block", "type": "paragraph", "paragraph": {"rich_text": [{"type": "text", "text": {"content": content}}]}}
+
+
+def test_request_size_limits() -> None:
+    """Test that chunks and split blocks stay within Notion's request size limit."""
+    print("\n" + "=" * 60)
+    print("Testing Request Size Limits")
+    print("=" * 60)
+
+    # Chunk boundary: a body of exactly the limit fits, one more byte does not
+    blocks = [_text_block("x" * 1900) for _ in range(300)]
+    _, sizes, _ = _fit_blocks(blocks, None)
+    end = _chunk_end(sizes, 0, len(blocks))
+    body = orjson.dumps({"children": blocks[:end]})
+    print(f"\n  Chunk of {end} blocks, {len(body)} bytes")
+    assert len(body) <= NOTION_MAX_REQUEST_BYTES
+    assert len(orjson.dumps({"children": blocks[:end + 1]})) > NOTION_MAX_REQUEST_BYTES
+
+    exact = [_text_block("x" * 1000), _text_block("")]
+    filler = NOTION_MAX_REQUEST_BYTES - len(orjson.dumps({"children": exact}))
+    exact[1] = _text_block("y" * filler)
+    _, sizes, _ = _fit_blocks(exact, None)
+    assert len(orjson.dumps({"children": exact})) == NOTION_MAX_REQUEST_BYTES
+    assert _chunk_end(sizes, 0, 100) == 2
+    exact[1] = _text_block("y" * (filler + 1))
+    _, sizes, _ = _fit_blocks(exact, None)
+    assert _chunk_end(sizes, 0, 100) == 1
+    print("  ✅ Exact-limit boundary respected")
+
+    # A single oversized block (toggle holding a long email) is split, not sent whole
+    children = [_text_block("中" * 2000) for _ in range(150)]
+    toggle = {"object": "block", "type": "toggle", "toggle": {"rich_text": [], "children": children}}
+    paragraph = {
+        "object": "block",
+        "type": "paragraph",
+        "paragraph": {"rich_text": [{"type": "text", "text": {"content": "文" * 2000}} for _ in range(100)]},
+    }
+    fitted, sizes, email_index = _fit_blocks([_text_block("intro"), toggle, paragraph], 1)
+    print(f"  Oversized blocks split into {len(fitted)} blocks: {sizes}")
+    assert email_index == 1
+    assert [block["type"] for block in fitted[1:-2]] == ["toggle"] * (len(fitted) - 3)
+    assert sum(len(block["toggle"]["children"]) for block in fitted[1:-2]) == len(children)
+    assert sum(len(block["paragraph"]["rich_text"]) for block in fitted[-2:]) == 100
+    for block, size in zip(fitted, sizes):
+        assert size == len(orjson.dumps(block)) <= NOTION_MAX_BLOCK_BYTES
+
+    start = 0
+    while start < len(fitted):
+        end = _chunk_end(sizes, start, 100)
+        assert len(orjson.dumps({"children": fitted[start:end]})) <= NOTION_MAX_REQUEST_BYTES
+        start = end
+    print("  ✅ Oversized blocks split within limits")
+
+    print("\n✅ Request size limit test passed!")
+
+
+def test_long_paragraph_blocks() -> None:
+    """Test that paragraphs over Notion's 2000-char segment limit are split, not truncated."""
+    print("\n" + "=" * 60)
+    print("Testing Long Paragraph Splitting")
+    print("=" * 60)
+
+    settings = get_settings()
+    publisher = NotionPublisher(settings)
+
+    plain = "a" * 4500
+    blocks = publisher._parse_markdown_to_blocks(plain)
+    segments = blocks[0]["paragraph"]["rich_text"]
+    print(f"\n  4500-char paragraph: {len(blocks)} block(s), segment lengths {[len(x['text']['content']) for x in segments]}")
+    assert len(blocks) == 1
+    assert [len(x["text"]["content"]) for x in segments] == [2000, 2000, 500]
+    assert "".join(x["text"]["content"] for x in segments) == plain
+
+    bold = "b" * 2500
+    blocks = publisher._parse_markdown_to_blocks(f"intro **{bold}** outro")
+    segments = blocks[0]["paragraph"]["rich_text"]
+    bold_segments = [x for x in segments if x.get("annotations", {}).get("bold")]
+    assert "".join(x["text"]["content"] for x in bold_segments) == bold
+    assert all(len(x["text"]["content"]) <= 2000 for x in segments)
+    print("  ✅ Annotated span split with its annotations kept")
+
+    huge = "c" * (2000 * 100 + 10)
+    blocks = publisher._parse_markdown_to_blocks(huge)
+    assert len(blocks) == 2
+    assert len(blocks[0]["paragraph"]["rich_text"]) == 100
+    assert sum(len(x["text"]["content"]) for b in blocks for x in b["paragraph"]["rich_text"]) == len(huge)
+    print("  ✅ Paragraph over 100 segments continues in a new block")
+
+    heading = publisher._parse_markdown_to_blocks("# " + "h" * 4500)[0]
+    assert all(len(x["text"]["content"]) <= 2000 for x in heading["heading_1"]["rich_text"])
+    print("  ✅ Long heading kept within the segment limit")
+
+    print("\n✅ Long paragraph test passed!")
+
+
+def test_aimd_controller() -> None:
+    """Test additive growth, multiplicative backoff and clamping of the chunk size."""
+    print("\n" + "=" * 60)
+    print("Testing AIMD Chunk Size Controller")
+    print("=" * 60)
+
+    controller = AimdController(initial=40, minimum=10, maximum=100, increase=10, decrease=0.5)
+    assert controller.size == 40
+
+    controller.on_success()
+    controller.on_success()
+    assert controller.size == 60
+    print(f"\n  After two successes: {controller.size}")
+
+    controller.on_failure()
+    assert controller.size == 30
+    controller.on_failure()
+    controller.on_failure()
+    assert controller.size == 10  # 7.5 clamped to the minimum
+    controller.on_failure()
+    assert controller.size == 10
+    print(f"  After repeated failures: {controller.size}")
+
+    for _ in range(20):
+        controller.on_success()
+    assert controller.size == 100  # clamped to the maximum
+    print(f"  After many successes: {controller.size}")
+
+    # Default controller starts at and never exceeds Notion's per-request block limit
+    default = AimdController()
+    default.on_success()
+    assert default.size == 100
+
+    print("\n✅ AIMD controller test passed!")
+
+
+def test_rate_limiter() -> None:
+    """Test that the token bucket allows a burst and then paces requests."""
+    print("\n" + "=" * 60)
+    print("Testing Notion Rate Limiter")
+    print("=" * 60)
+
+    # Reservations: the first `burst` slots are free, then one per interval
+    limiter = RateLimiter(rate=20.0, burst=3)
+    delays = [limiter._reserve() for _ in range(6)]
+    print(f"\n  Reserved delays: {[round(d, 3) for d in delays]}")
+    assert delays[:3] == [0.0, 0.0, 0.0]
+    for expected, delay in zip((0.05, 0.10, 0.15), delays[3:]):
+        assert abs(delay - expected) < 0.01, delays
+
+    # acquire sleeps for the reserved delay
+    limiter = RateLimiter(rate=20.0, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    burst_elapsed = time.monotonic() - started
+    limiter.acquire()
+    limiter.acquire()
+    paced_elapsed = time.monotonic() - started
+    print(f"  Burst of 3: {burst_elapsed:.3f}s, 5 requests: {paced_elapsed:.3f}s")
+    assert burst_elapsed < 0.03
+    assert 0.09 <= paced_elapsed < 0.3
+
+    # An idle limiter refills up to the burst, not beyond
+    time.sleep(0.3)
+    delays = [limiter._reserve() for _ in range(4)]
+    assert delays[:3] == [0.0, 0.0, 0.0] and delays[3] > 0.03, delays
+
+    print("\n✅ Rate limiter test passed!")
+
+
+def _http_error(status: int) -> HTTPResponseError:
+    """Build a Notion HTTP error with the given status."""
+    return HTTPResponseError("test_error", status, f"HTTP {status}", httpx.Headers(), "")
+
+
+def _fail_through(breaker: CircuitBreaker, exc: Exception) -> None:
+    """Run one failing call through the breaker."""
+    try:
+        with breaker:
+            raise exc
+    except type(exc):
+        pass
+
+
+def test_circuit_breaker() -> None:
+    """Test that the breaker opens after consecutive outage errors, half-opens and closes again."""
+    print("\n" + "=" * 60)
+    print("Testing Notion Circuit Breaker")
+    print("=" * 60)
+
+    breaker = CircuitBreaker(fail_max=3, reset_timeout=0.1)
+
+    # Request bugs (4xx) are not outages and never open the circuit
+    for _ in range(5):
+        _fail_through(breaker, _http_error(400))
+    assert not breaker.is_open
+
+    # A success resets the consecutive count
+    _fail_through(breaker, _http_error(503))
+    _fail_through(breaker, ConnectionError("reset by peer"))
+    with breaker:
+        pass
+    _fail_through(breaker, _http_error(429))
+    _fail_through(breaker, TimeoutError("slow"))
+    assert not breaker.is_open
+
+    _fail_through(breaker, httpx.ConnectError("refused"))
+    assert breaker.is_open
+    try:
+        with breaker:
+            raise AssertionError("call went through an open circuit")
+    except CircuitOpenError as e:
+        print(f"\n  Open: {e}")
+
+    time.sleep(0.15)
+    assert not breaker.is_open
+    with breaker:
+        pass
+    # Closed again: it takes fail_max failures to reopen
+    _fail_through(breaker, _http_error(500))
+    _fail_through(breaker, _http_error(500))
+    assert not breaker.is_open
+    print("  ✅ Opened after 3 outage errors, closed after the cool-down")
+
+    # A third consecutive failure opens it again
+    _fail_through(breaker, _http_error(500))
+    assert breaker.is_open
+
+    # Half-open: after the cool-down a single failure reopens the circuit at once
+    time.sleep(0.15)
+    assert not breaker.is_open
+    _fail_through(breaker, _http_error(502))
+    assert breaker.is_open
+    print("  ✅ Half-open failure reopened the circuit")
+
+    # ...while a half-open success closes it fully
+    time.sleep(0.15)
+    with breaker:
+        pass
+    _fail_through(breaker, _http_error(502))
+    _fail_through(breaker, _http_error(502))
+    assert not breaker.is_open
+    _fail_through(breaker, _http_error(502))
+    assert breaker.is_open
+    print("  ✅ Half-open success closed the circuit")
+
+    print("\n✅ Circuit breaker test passed!")
+
+
+class _FlakyPages:
+    """pages.create stand-in that raises the queued errors before succeeding."""
+
+    def __init__(self, errors: list) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def create(self, **kwargs) -> dict:
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return {"id": "page-ok"}
+
+
+class _FlakyClient:
+    def __init__(self, errors: list) -> None:
+        self.pages = _FlakyPages(errors)
+
+
+def test_push_timeouts_and_transport_errors() -> None:
+    """Test that SDK timeouts and raw httpx errors are retried and never escape push."""
+    print("\n" + "=" * 60)
+    print("Testing Notion Timeouts / Transport Errors")
+    print("=" * 60)
+
+    settings = get_settings()
+    publisher = NotionPublisher(settings)
+    create_fast = NotionPublisher._create_page_with_retry.retry_with(wait=wait_none(), stop=stop_after_attempt(3))
+
+    # Retried: one SDK timeout and one connect error, then success
+    publisher.client = _FlakyClient([RequestTimeoutError(), httpx.ConnectError("refused")])
+    assert create_fast(publisher, {"Name": {}})["id"] == "page-ok"
+    assert publisher.client.pages.calls == 3
+    print("\n  ✅ RequestTimeoutError and httpx.ConnectError retried")
+
+    # Once retries are exhausted, push reports the failure as None instead of raising
+    for error in (RequestTimeoutError(), httpx.ReadError("connection reset")):
+        publisher = NotionPublisher(settings)
+        publisher.client = _FlakyClient([error] * 3)
+        publisher._create_page_with_retry = functools.partial(create_fast, publisher)
+        gist = create_test_gist().model_copy(update={"original_id": f"timeout-{type(error).__name__}"})
+        assert publisher.push(gist) is None
+        print(f"  ✅ push returned None for {type(error).__name__}")
+
+    # A push that recovers within its retries still publishes the page
+    publisher = NotionPublisher(settings)
+    publisher.client = _FlakyClient([RequestTimeoutError()])
+    publisher._create_page_with_retry = functools.partial(create_fast, publisher)
+    assert publisher.push(create_test_gist()) == "page-ok"
+    print("  ✅ push published after a retried timeout")
+
+    print("\n✅ Timeout / transport error test passed!")
+
+
+def test_build_cache() -> None:
+    """Test that a failed push's page build is reused only while the gist is unchanged."""
+    print("\n" + "=" * 60)
+    print("Testing Page Build Cache")
+    print("=" * 60)
+
+    publisher = NotionPublisher(get_settings())
+    create_fast = NotionPublisher._create_page_with_retry.retry_with(wait=wait_none(), stop=stop_after_attempt(1))
+    publisher._create_page_with_retry = functools.partial(create_fast, publisher)
+    gist = create_test_gist()
+
+    publisher.client = _FlakyClient([RequestTimeoutError()])
+    assert publisher.push(gist) is None
+    built = publisher._build_cache[gist.original_id][1]
+    assert publisher._build_page(gist.model_copy()) is built
+    print("\n  ✅ Unchanged gist reuses the build of the failed push")
+
+    edited = gist.model_copy(update={"summary": gist.summary + " (edited)"})
+    assert publisher._build_page(edited) is not built
+    assert len(publisher._build_cache) == 1
+    print("  ✅ Edited gist is rebuilt")
+
+    assert publisher.push(edited) == "page-ok"
+    assert gist.original_id not in publisher._build_cache
+    print("  ✅ Entry dropped once published")
+
+    print("\n✅ Build cache test passed!")
+
+
 def main() -> None:
     """Run all tests."""
     print("=" * 60)
@@ -291,7 +638,28 @@ def main() -> None:
     # Test 4: Spam filtering
     test_spam_filtering()
 
-    # Test 5: Full publish (requires real credentials)
+    # Test 5: AIMD chunk sizing
+    test_aimd_controller()
+
+    # Test 6: Request pacing
+    test_rate_limiter()
+
+    # Test 7: Circuit breaker
+    test_circuit_breaker()
+
+    # Test 8: Long paragraph splitting
+    test_long_paragraph_blocks()
+
+    # Test 9: Request size limits
+    test_request_size_limits()
+
+    # Test 10: Timeouts and transport errors (mocked Notion calls)
+    test_push_timeouts_and_transport_errors()
+
+    # Test 11: Page build cache (mocked Notion calls)
+    test_build_cache()
+
+    # Test 12: Full publish (requires real credentials)
     test_full_publish()
 
     print("\n" + "=" * 60)
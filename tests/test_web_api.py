@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Web API test script.
+Exercises the Flask endpoints through the test client against a temporary database.
+"""
+
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from gistflow.database import LocalStore
+from gistflow.web import create_app
+
+
+class _FakePublisher:
+    """Records which message IDs the API asked the publisher to forget."""
+
+    def __init__(self) -> None:
+        self.forgotten: list = []
+
+    def forget_published(self, original_id=None) -> None:
+        self.forgotten.append(original_id)
+
+
+class _FakePipeline:
+    """Just enough of GistFlowPipeline for the task endpoints."""
+
+    def __init__(self) -> None:
+        self.notion_publisher = _FakePublisher()
+        self._run_lock = threading.Lock()
+        self._is_running = False
+        self._shutdown_requested = False
+        self._last_run = None
+        self.run_errors = 0
+
+    def _run_once_locked(self) -> dict:
+        try:
+            return {"emails_processed": 1, "errors": self.run_errors}
+        finally:
+            self._run_lock.release()
+
+
+def test_retry_and_reprocess_forget_published() -> None:
+    """Test that retry/reprocess unmark the email and clear the publisher's dedup entry."""
+    print("\n" + "=" * 60)
+    print("Testing Task Retry / Reprocess")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalStore(Path(tmp_dir) / "api.db")
+        pipeline = _FakePipeline()
+        client = create_app(pipeline_instance=pipeline, local_store=store).test_client()
+
+        for endpoint in ("/api/tasks/retry", "/api/tasks/reprocess"):
+            message_id = f"msg{endpoint}"
+            store.mark_processed(message_id=message_id, subject="s", sender="x", score=50)
+
+            response = client.post(endpoint, json={"message_id": message_id})
+            print(f"\n  {endpoint}: {response.status_code} {response.get_json()}")
+            assert response.status_code == 200, response.get_json()
+            assert response.get_json()["success"] is True
+            assert not store.is_processed(message_id)
+            assert pipeline.notion_publisher.forgotten[-1] == message_id
+
+            # Already unmarked: nothing left to remove
+            response = client.post(endpoint, json={"message_id": message_id})
+            assert response.status_code == 404
+
+        assert len(pipeline.notion_publisher.forgotten) == 2
+        store.close()
+
+    print("\n✅ Task retry / reprocess test passed!")
+
+
+def test_reset_reports_held_run_lock() -> None:
+    """Test that reset only promises a restart once the run lock is free."""
+    print("\n" + "=" * 60)
+    print("Testing Task Reset")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalStore(Path(tmp_dir) / "api.db")
+        pipeline = _FakePipeline()
+        client = create_app(pipeline_instance=pipeline, local_store=store).test_client()
+
+        # A run in progress holds the lock until it reaches a check point
+        pipeline._run_lock.acquire()
+        pipeline._is_running = True
+        pipeline._last_run = {"running": True, "finished_at": None}
+
+        response = client.post("/api/tasks/reset")
+        data = response.get_json()
+        print(f"\n  reset while running: {response.status_code} {data}")
+        assert response.status_code == 200
+        assert data["can_restart"] is False
+        assert pipeline._shutdown_requested is True
+        assert pipeline._last_run["running"] is False
+        assert client.post("/api/tasks/run").status_code == 409
+
+        # The interrupted run exits and releases the lock
+        pipeline._run_lock.release()
+        response = client.post("/api/tasks/reset")
+        print(f"  reset after exit: {response.status_code} {response.get_json()}")
+        assert response.get_json()["can_restart"] is True
+
+        store.close()
+
+    print("\n✅ Task reset test passed!")
+
+
+def _wait_for_job(client, job_id: str) -> dict:
+    """Poll a manual run until it leaves the queued/running states."""
+    for _ in range(100):
+        data = client.get(f"/api/tasks/run/{job_id}").get_json()
+        if data["status"] not in ("queued", "running"):
+            return data
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_run_job_status() -> None:
+    """Test that run jobs report counted errors as failed and cancelled jobs free the run lock."""
+    print("\n" + "=" * 60)
+    print("Testing Manual Run Job Status")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalStore(Path(tmp_dir) / "api.db")
+        pipeline = _FakePipeline()
+        app = create_app(pipeline_instance=pipeline, local_store=store)
+        client = app.test_client()
+
+        for errors, expected in ((0, "done"), (2, "failed")):
+            pipeline.run_errors = errors
+            response = client.post("/api/tasks/run")
+            assert response.status_code == 202
+            data = _wait_for_job(client, response.get_json()["job_id"])
+            print(f"\n  errors={errors}: {data}")
+            assert data["status"] == expected
+            assert data["stats"]["errors"] == errors
+        assert client.get("/api/tasks/run/unknown").status_code == 404
+
+        # Occupy the single worker so the next run stays queued, then cancel it as cleanup() does
+        app.config["_run_executor"].shutdown(wait=True)
+        executor = ThreadPoolExecutor(max_workers=1)
+        app.config["_run_executor"] = executor
+        gate = threading.Event()
+        executor.submit(gate.wait)
+        job_id = client.post("/api/tasks/run").get_json()["job_id"]
+        assert client.get(f"/api/tasks/run/{job_id}").get_json()["status"] == "queued"
+        assert pipeline._run_lock.locked()
+
+        executor.shutdown(wait=False, cancel_futures=True)
+        gate.set()
+        data = client.get(f"/api/tasks/run/{job_id}").get_json()
+        print(f"  cancelled: {data}")
+        assert data["status"] == "cancelled"
+        assert not pipeline._run_lock.locked()
+        store.close()
+
+    print("\n✅ Manual run job status test passed!")
+
+
+class _FailingHistoryStore(LocalStore):
+    """LocalStore whose prompt history cursor fails on the first row."""
+
+    def iter_prompt_history(self, prompt_type=None, limit=50):
+        def rows():
+            raise sqlite3.OperationalError("disk I/O error")
+            yield
+
+        return rows()
+
+
+def test_prompt_history_limit_and_errors() -> None:
+    """Test limit clamping and that a failing history read returns a 500."""
+    print("\n" + "=" * 60)
+    print("Testing Prompt History")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalStore(Path(tmp_dir) / "api.db")
+        for i in range(3):
+            store.save_prompt_version("system", f"prompt {i}")
+        client = create_app(pipeline_instance=_FakePipeline(), local_store=store).test_client()
+
+        for query, expected in (("", 3), ("?limit=2", 2), ("?limit=-1", 1), ("?limit=0", 1), ("?limit=abc", 3)):
+            response = client.get(f"/api/prompts/history{query}")
+            history = response.get_json()["history"]
+            print(f"\n  limit {query or '(default)'}: {response.status_code}, {len(history)} rows")
+            assert response.status_code == 200
+            assert len(history) == expected
+
+        response = client.get("/api/prompts/history?type=user")
+        assert response.status_code == 200 and response.get_json() == {"history": []}
+        store.close()
+
+        failing = _FailingHistoryStore(Path(tmp_dir) / "failing.db")
+        client = create_app(pipeline_instance=_FakePipeline(), local_store=failing).test_client()
+        response = client.get("/api/prompts/history")
+        print(f"  failing read: {response.status_code} {response.get_json()}")
+        assert response.status_code == 500
+        assert "disk I/O error" in response.get_json()["error"]
+        failing.close()
+
+    print("\n✅ Prompt history test passed!")
+
+
+class _BrokenPipeline(_FakePipeline):
+    """Pipeline whose task controls fail unexpectedly."""
+
+    def stop_current_task(self) -> bool:
+        raise RuntimeError("scheduler exploded")
+
+
+def test_pipeline_endpoint_errors() -> None:
+    """Test the 503 and 500 responses of pipeline-backed endpoints."""
+    print("\n" + "=" * 60)
+    print("Testing Pipeline Endpoint Errors")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = LocalStore(Path(tmp_dir) / "api.db")
+
+        # No pipeline at all
+        client = create_app(pipeline_instance=None, local_store=store).test_client()
+        for method, endpoint in (("post", "/api/tasks/stop-current"), ("get", "/api/tasks/status"), ("get", "/api/prompts")):
+            response = getattr(client, method)(endpoint)
+            print(f"\n  no pipeline {endpoint}: {response.status_code} {response.get_json()}")
+            assert response.status_code == 503
+            assert response.get_json() == {"success": False, "error": "Pipeline not available"}
+
+        # A pipeline without an LLM engine cannot serve the prompt endpoints
+        client = create_app(pipeline_instance=_BrokenPipeline(), local_store=store).test_client()
+        assert client.get("/api/prompts").status_code == 503
+
+        # Unexpected exceptions become a 500 with the error message
+        response = client.post("/api/tasks/stop-current")
+        print(f"  failing handler: {response.status_code} {response.get_json()}")
+        assert response.status_code == 500
+        assert response.get_json() == {"success": False, "error": "scheduler exploded"}
+        store.close()
+
+    print("\n✅ Pipeline endpoint error test passed!")
+
+
+def main() -> None:
+    """Run all tests."""
+    print("=" * 60)
+    print("GistFlow Web API Tests")
+    print("=" * 60)
+
+    test_retry_and_reprocess_forget_published()
+    test_reset_reports_held_run_lock()
+    test_run_job_status()
+    test_prompt_history_limit_and_errors()
+    test_pipeline_endpoint_errors()
+
+    print("\n" + "=" * 60)
+    print("All tests completed!")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()